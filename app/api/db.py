@@ -1 +0,0 @@
-def get_connection():
@@ -1,37 +1,67 @@
 from fastapi import APIRouter, HTTPException, Request, Response
-from app.core.db import get_connection
-import bcrypt
+from app.core.db import get_async_connection
+from app.crud import user as crud_user
+from app.services import activity, login_guard, password_service, user_cache
 
 router = APIRouter()
 
 @router.post("/login")
 async def login(request: Request, response: Response):
-    data = await request.json()
-    email = data.get('email')
-    password = data.get('password')
-    if not email or not password:
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 요청 형식입니다.")
+    email = data.get('email') if isinstance(data, dict) else None
+    password = data.get('password') if isinstance(data, dict) else None
+    # 문자열이 아니거나 비어 있으면 DB 조회/시도 제한 전에 400 (이메일은 소문자로 정규화)
+    if not isinstance(email, str) or not isinstance(password, str) or not email.strip() or not password:
         raise HTTPException(status_code=400, detail="이메일과 비밀번호를 입력하세요.")
-    conn = get_connection()
+    email = email.strip().lower()
+    ip = login_guard.client_ip(request)
+    # 시도 횟수 제한: DB 조회/bcrypt 전에 거절 (429 + Retry-After)
+    rejected = await login_guard.check(ip, email)
+    if rejected:
+        detail, retry_after = rejected
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(int(retry_after))})
     try:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT id, name, email, password FROM users WHERE email=%s", (email,))
-            user = cursor.fetchone()
-            if not user:
-                raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다.")
-            if not bcrypt.checkpw(password.encode('utf-8'), user['password'].encode('utf-8')):
-                # bcrypt.checkpw(): 사용자가 입력한 password와 DB에 저장된 해시된 비밀번호 비교 
-                raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다.")
-            request.session['user_id'] = user['id']
-            # 세션에 로그인한 사용자 번호와 이름, 이메일 저장
-            request.session['user_name'] = user['name']
-            request.session['user_email'] = user['email']
-            return {"id": user['id'], "name": user['name'], "email": user['email']}
+        user = await user_cache.get_user_for_login(email)
+        hashed = user['password'] if user else None
+        if login_guard.is_known_failure(email, hashed, password):
+            # 방금 틀린 것으로 확인된 비밀번호를 다시 보낸 경우 bcrypt 생략
+            matched = False
+        elif not user:
+            # 없는 이메일도 bcrypt 검증 1번과 같은 시간을 쓴 뒤 실패 (응답시간으로 가입 여부가 드러나지 않게)
+            matched = await password_service.verify_dummy(password)
+            login_guard.record_dummy_verification()
+        else:
+            # bcrypt.checkpw(): 사용자가 입력한 password와 DB에 저장된 해시된 비밀번호 비교
+            # CPU를 오래 쓰는 작업이라 이벤트 루프가 멈추지 않도록 password_service의 프로세스 풀에서 실행
+            matched = await password_service.verify_password(password, hashed)
+        if not matched:
+            await login_guard.record_failure(ip, email, hashed, password)
+            raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다.")
+        await login_guard.record_success(ip, email)
+        # BCRYPT_ROUNDS 설정이 바뀌었으면 평문 비밀번호를 알고 있는 지금 새 cost로 재해싱
+        if password_service.needs_rehash(user['password']):
+            new_hash = await password_service.hash_password(password)
+            async with get_async_connection() as conn:
+                await crud_user.update_user(conn, user['id'], {"password": new_hash})
+                await conn.commit()
+            await user_cache.invalidate_user(user['id'], user['email'])
+            password_service.record_rehash()
+        # 로그인 전에 쓰던 세션 id는 버리고 새 id로 (세션 고정 공격 방지)
+        request.session.regenerate()
+        request.session['user_id'] = user['id']
+        # 세션에 로그인한 사용자 번호와 이름, 이메일 저장
+        request.session['user_name'] = user['name']
+        request.session['user_email'] = user['email']
+        # 마지막 로그인 시각/로그인 횟수는 바로 UPDATE하지 않고 모아서 나중에 한 번에 씀
+        activity.record_login(user['id'])
+        return {"id": user['id'], "name": user['name'], "email": user['email']}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="DB Error: " + str(e))
-    finally:
-        conn.close()
 
 @router.post("/logout")
 def logout(request: Request):
@@ -1,7 +1,146 @@
-# 게시글 관련 라우터 정의 예정
+# 게시글 관련 라우터
+# - 목록(전체 피드, 작성자별)은 (created_at, id) keyset 페이지네이션: 다음 페이지 커서는 Link/X-Next-Cursor 헤더로 전달
+# - 작성자 정보는 글마다 조회하지 않고, 목록에 나온 작성자 id를 모아서 한 번에 조회 (요청별 DataLoader)
+#   -> 피드 한 페이지 = 게시글 쿼리 1번 + (캐시에 없는 작성자가 있을 때만) 작성자 쿼리 1번
+# - 작성자의 게시글 수는 users.post_count에 중복 저장 (글 작성 시 같은 트랜잭션에서 +1)
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from app.api.users import get_current_user_id
+from app.core.db import can_use_replica, get_async_connection, mark_write
+from app.core.fastjson import FAST_JSON, FastJSONResponse, RowSerializer
+from app.crud import post as crud_post
+from app.schemas.post import PostCreate, PostOut
+from app.services import user_cache
+from app.services.dataloader import user_loader
 
 router = APIRouter()
 
-# ...existing code...
\ No newline at end of file
+POSTS_PAGE_SIZE = 20
+
+post_json = RowSerializer(PostOut)
+
+
+def _encode_cursor(post):
+    # 이전 페이지 마지막 글의 (created_at, id)를 URL에 넣기 좋은 문자열로
+    raw = f"{post['created_at'].isoformat()}|{post['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, post_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def _author(user):
+    # PostAuthor 필드 순서대로 (빠른 JSON 경로가 응답 모델과 같은 키 순서를 내도록)
+    if user is None:
+        return None
+    return {"id": user['id'], "name": user['name'], "post_count": user.get('post_count', 0)}
+
+
+async def _with_authors(request, posts):
+    """게시글 목록에 작성자 정보를 붙인다 (작성자 조회는 한 번에)"""
+    authors = await user_loader(request).load_many([post['author_id'] for post in posts])
+    return [{**post, "author": _author(author)} for post, author in zip(posts, authors)]
+
+
+async def _page_response(request, response, posts, limit):
+    headers = {}
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = _encode_cursor(posts[-1])
+        headers["Link"] = f'<{request.url.path}?limit={limit}&cursor={next_cursor}>; rel="next"'
+        headers["X-Next-Cursor"] = next_cursor
+    posts = await _with_authors(request, posts)
+    if FAST_JSON:
+        return FastJSONResponse(post_json.dumps_many(posts), headers=headers)
+    response.headers.update(headers)
+    return posts
+
+
+@router.post("/posts", response_model=PostOut, status_code=status.HTTP_201_CREATED)
+async def create_post(request: Request, post: PostCreate, author_id: int = Depends(get_current_user_id)):
+    """게시글 작성 (로그인 필요)"""
+    # DATETIME 컬럼은 초 단위로 저장되므로 응답도 같은 값으로
+    now = datetime.now().replace(microsecond=0)
+    try:
+        async with get_async_connection() as conn:
+            post_id = await crud_post.insert_post(conn, author_id, post.title, post.content, now)
+            await conn.commit()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
+    # 캐시된 작성자 정보의 post_count가 바뀌었으므로 제거
+    await user_cache.invalidate_user(author_id)
+    mark_write(request.session)
+    author = await user_cache.get_user(author_id)
+    return {
+        "id": post_id,
+        "author_id": author_id,
+        "title": post.title,
+        "content": post.content,
+        "created_at": now,
+        "author": _author(author),
+    }
+
+
+@router.get("/posts", response_model=List[PostOut])
+async def get_feed(
+    request: Request,
+    response: Response,
+    limit: int = Query(POSTS_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 페이지 응답의 X-Next-Cursor 값"),
+):
+    """전체 피드 (최신 글부터, keyset 페이지네이션)"""
+    before = _decode_cursor(cursor)
+    readonly = can_use_replica(request.session)
+    try:
+        async with get_async_connection(readonly=readonly) as conn:
+            # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+            posts = await crud_post.list_posts(conn, limit + 1, before)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
+    return await _page_response(request, response, posts, limit)
+
+
+@router.get("/posts/{post_id}", response_model=PostOut)
+async def get_post(request: Request, post_id: int):
+    """게시글 하나 조회"""
+    readonly = can_use_replica(request.session)
+    async with get_async_connection(readonly=readonly) as conn:
+        post = await crud_post.get_post(conn, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    post = (await _with_authors(request, [post]))[0]
+    if FAST_JSON:
+        return FastJSONResponse(post_json.dumps(post))
+    return post
+
+
+@router.get("/users/{user_id}/posts", response_model=List[PostOut])
+async def get_posts_by_author(
+    request: Request,
+    response: Response,
+    user_id: int,
+    limit: int = Query(POSTS_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 페이지 응답의 X-Next-Cursor 값"),
+):
+    """작성자 한 명의 글 목록 (최신 글부터, keyset 페이지네이션)"""
+    before = _decode_cursor(cursor)
+    readonly = can_use_replica(request.session)
+    # 작성자 정보는 보통 캐시에 있음 (없는 회원이면 404)
+    if not await user_cache.get_user(user_id, readonly=readonly):
+        raise HTTPException(status_code=404, detail="User not found")
+    async with get_async_connection(readonly=readonly) as conn:
+        posts = await crud_post.list_posts_by_author(conn, user_id, limit + 1, before)
+    return await _page_response(request, response, posts, limit)
@@ -0,0 +1,66 @@
+# 운영 모니터링용 통계 라우터
+# 풀 크기, 캐시 적중률, 라우트별 지연, 로그인 제한 카운터 등 내부 정보라서 아무나 보면 안 된다.
+# - METRICS_TOKEN 설정 시: X-Metrics-Token 헤더(또는 Authorization: Bearer)가 같은 요청만 허용
+# - 설정하지 않으면: 같은 서버(127.0.0.1, ::1)에서 프록시를 거치지 않고 온 요청만 허용
+# 프록시 뒤에서 운영할 때는 프록시에서도 /stats, /metrics 를 막을 것
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from app.core.compression import compression_stats
+from app.core.db import pool_stats, async_pool_stats, startup_stats
+from app.core.metrics import render_prometheus
+from app.core.pages import page_cache_stats
+from app.services.activity import activity_stats
+from app.services.login_guard import guard_stats
+from app.services.password_service import hasher_stats
+from app.services.user_cache import cache_stats
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+_LOCAL_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+
+def require_metrics_access(request: Request):
+    if METRICS_TOKEN:
+        token = request.headers.get("x-metrics-token") or request.headers.get("authorization", "").removeprefix("Bearer ")
+        if secrets.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+            return
+    else:
+        host = request.client.host if request.client else None
+        # 프록시가 전달한 요청은 프록시 서버 자신(127.0.0.1)에서 온 것처럼 보이므로 제외
+        if host in _LOCAL_HOSTS and "x-forwarded-for" not in request.headers and "forwarded" not in request.headers:
+            return
+    raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
+
+
+router = APIRouter(dependencies=[Depends(require_metrics_access)])
+
+
+def collect_stats():
+    return {
+        "db_pool": pool_stats(),
+        "db_async_pool": async_pool_stats(),
+        "db_startup": startup_stats(),
+        "password_hasher": hasher_stats(),
+        "user_cache": cache_stats(),
+        "login_guard": guard_stats(),
+        "page_cache": page_cache_stats(),
+        "compression": compression_stats(),
+        "activity": activity_stats(),
+    }
+
+
+@router.get("/stats")
+def get_stats():
+    """DB 커넥션 풀, 비밀번호 해싱 대기열 등 서버 내부 상태 조회 (모니터링 수집용)"""
+    return collect_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus 수집용: 요청/DB/풀 대기/bcrypt 히스토그램 + /stats 값(게이지)"""
+    return PlainTextResponse(
+        render_prometheus(collect_stats()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
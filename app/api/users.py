@@ -1,133 +1,301 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import csv
+import io
+import os
 from datetime import datetime
-from app.schemas.user import UserCreate, UserUpdate, UserOut
-import bcrypt
-from app.core.db import get_connection
+from app.schemas.user import USER_BATCH_MAX, UserActivityOut, UserBatchOut, UserBatchRequest, UserCreate, UserUpdate, UserOut
+from app.core.conditional import etag_matches, not_modified
+from app.core.db import can_use_replica, get_async_connection, is_duplicate_key_error, mark_write
+from app.core.fastjson import FAST_JSON, FastJSONResponse, RowSerializer
+from app.crud import activity as crud_activity
+from app.crud import user as crud_user
+from app.services import activity, password_service, user_cache, user_import
+from app.services.dataloader import user_loader
 
 router = APIRouter()
 
+# 모든 라우터는 async def + aiomysql 비동기 커넥션 풀을 사용한다.
+# (동기 def + pymysql이면 Starlette 스레드풀(기본 40개)에서 실행되어 처리량이 제한됨)
+# bcrypt 해싱/검증은 password_service(전용 프로세스 풀)에서 실행한다.
+# 읽기 API는 복제본(readonly=True)에서 읽되, 방금 수정한 세션은 잠시 원본에서 읽는다 (mark_write/can_use_replica).
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# 스트리밍 내보내기에서 행을 모아 한 번에 보내는 크기(바이트). 행마다 보내면 send/압축 flush가 행 수만큼 생김
+STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', str(16 * 1024)))
+
+# 읽기 API는 DB 행을 검증 없이 바로 JSON으로 (FAST_JSON=0 이면 response_model 검증 경로 사용)
+user_json = RowSerializer(UserOut)
+user_batch_json = RowSerializer(UserBatchOut)
+
+
+def _user_etag(user_id, version):
+    # 약한 ETag: 회원 id + 버전 (수정할 때마다 version이 바뀜)
+    return f'W/"user-{user_id}-v{version}"'
+
+
+async def _conditional_user_response(request, response, user_id, vary_cookie=False):
+    """
+    회원 하나 조회 응답 (조건부 GET 지원)
+    If-None-Match가 버전 맵의 ETag와 같으면 캐시/DB 조회와 직렬화 없이 304
+    """
+    # 매번 재검증하되(no-cache), 바뀌지 않았으면 304로 본문 없이 응답
+    headers = {"Cache-Control": "private, no-cache"}
+    if vary_cookie:
+        headers["Vary"] = "Cookie"
+    version = user_cache.get_version(user_id)
+    if version is not None and etag_matches(request, _user_etag(user_id, version)):
+        return not_modified({**headers, "ETag": _user_etag(user_id, version)})
+
+    user = await user_cache.get_user(user_id, readonly=can_use_replica(request.session))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    headers["ETag"] = _user_etag(user_id, user.get('version', 0))
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+    if FAST_JSON:
+        return FastJSONResponse(user_json.dumps(user), headers=headers)
+    response.headers.update(headers)
+    return user
+
 
 @router.get("/users", response_model=List[UserOut])
-def get_users():
-    """모든 사용자 목록 조회"""
-    conn = get_connection()
+async def get_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[int] = Query(None, ge=0, description="이전 페이지 마지막 사용자 id (keyset 커서)"),
+    format: Optional[str] = Query(None, description="ndjson이면 전체 목록을 스트리밍"),
+):
+    """
+    사용자 목록 조회 (id 순 keyset 페이지네이션)
+    - 다음 페이지가 있으면 Link 헤더(rel="next")와 X-Next-Cursor 헤더로 다음 커서를 알려준다.
+    - format=ndjson (또는 Accept: application/x-ndjson)이면 after 이후 전체를 한 줄에 한 명씩 스트리밍
+    """
+    readonly = can_use_replica(request.session)
+    if format == "ndjson" or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(_stream_users_ndjson(after, readonly), media_type=NDJSON_MEDIA_TYPE)
     try:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT id, name, email, created_at FROM users")
-            users = cursor.fetchall()
-        return users
+        async with get_async_connection(readonly=readonly) as conn:
+            # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+            users = await crud_user.list_users(conn, limit + 1, after)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
-    finally:
-        conn.close()
+    headers = {}
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = users[-1]['id']
+        headers["Link"] = f'<{request.url.path}?limit={limit}&after={next_cursor}>; rel="next"'
+        headers["X-Next-Cursor"] = str(next_cursor)
+    if FAST_JSON:
+        return FastJSONResponse(user_json.dumps_many(users), headers=headers)
+    response.headers.update(headers)
+    return users
+
+
+async def _stream_users_ndjson(after, readonly=False):
+    # 스트리밍 동안 커넥션 하나를 잡고 서버 사이드 커서로 조금씩 읽어서 STREAM_CHUNK_SIZE만큼 모이면 내보낸다.
+    chunk = []
+    size = 0
+    async with get_async_connection(readonly=readonly) as conn:
+        async for row in crud_user.iter_users(conn, after):
+            if FAST_JSON:
+                line = user_json.dumps(row) + b"\n"
+            else:
+                line = (UserOut.model_validate(row).model_dump_json() + "\n").encode('utf-8')
+            chunk.append(line)
+            size += len(line)
+            if size >= STREAM_CHUNK_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+    if chunk:
+        yield b"".join(chunk)
 
 # 의존성 함수
-def get_current_user_id(request: Request) -> int:
+# async def: 동기 def 의존성은 요청마다 스레드풀을 거치므로, 세션만 읽는 가벼운 함수는 이벤트 루프에서 바로 실행
+async def get_current_user_id(request: Request) -> int:
     user_id = request.session.get("user_id")
     if not user_id:
         raise HTTPException(status_code=401, detail="로그인 필요")
+    # 마지막 접속 시각 (메모리에 모았다가 app/services/activity.py 가 주기적으로 DB에 씀)
+    activity.record_seen(user_id)
     return user_id
 
 #Depends()를 사용하면, FastAPI가 해당 파라미터에 필요한 값을 자동으로 주입해줌.
 #/users/me 요청이 들어오면 /users/{user_id} 경로가 먼저 매칭됨."me"를 user_id로 해석하려다 타입 에러 발생
 #더 구체적인 경로를 먼저 선언하자
 @router.get("/users/me", response_model=UserOut)
-def get_me(user_id: int = Depends(get_current_user_id)):
-    """현재 로그인한 사용자 정보 반환"""
-    
+async def get_me(request: Request, response: Response, user_id: int = Depends(get_current_user_id)):
+    """현재 로그인한 사용자 정보 반환 (ETag/If-None-Match 지원)"""
+
     if not user_id:
         raise HTTPException(status_code=401, detail="로그인 필요")
-    conn = get_connection()
+    # 같은 URL이라도 로그인한 사용자(세션 쿠키)마다 내용이 다름
+    return await _conditional_user_response(request, response, user_id, vary_cookie=True)
+
+
+
+@router.post("/users/bulk")
+async def bulk_create_users(request: Request, user_id: int = Depends(get_current_user_id)):
+    """
+    회원 대량 가입 (로그인 필요)
+    - 본문: NDJSON (Content-Type: application/x-ndjson, 한 줄에 {"name", "email", "password"})
+            또는 CSV (Content-Type: text/csv, 첫 줄 헤더 name,email,password, UTF-8 BOM 허용)
+    - 본문을 스트리밍으로 읽어 묶음(BULK_CHUNK_SIZE)마다 검증 -> 병렬 해싱 -> executemany INSERT
+    - 줄별 결과를 반환 (성공: id, 실패: 사유)
+    - USER_IMPORT_MAX_ROWS줄을 넘으면 413 (그 전 묶음까지는 가입됨, detail.created)
+    """
+    content_type = request.headers.get("content-type", "")
+    fmt = "csv" if "csv" in content_type else "ndjson"
     try:
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT id, name, email, created_at FROM users WHERE id=%s",
-                (user_id,)
-            )
-            user = cursor.fetchone()
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-        return user
-    finally:
-        conn.close()        
+        results = await user_import.import_users(request.stream(), fmt)
+    except user_import.TooManyRows as e:
+        if e.created:
+            mark_write(request.session)
+        raise HTTPException(status_code=413, detail={"message": str(e), "created": e.created})
+    created = sum(1 for result in results if result["status"] == "created")
+    if created:
+        mark_write(request.session)
+    return {"created": created, "failed": len(results) - created, "results": results}
 
 
+@router.get("/users/export")
+async def export_users(request: Request, format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """전체 회원 내보내기 (서버 사이드 커서로 스트리밍, format=ndjson|csv)"""
+    readonly = can_use_replica(request.session)
+    if format == "csv":
+        return StreamingResponse(
+            _stream_users_csv(readonly),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="users.csv"'},
+        )
+    return StreamingResponse(
+        _stream_users_ndjson(None, readonly),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'},
+    )
+
+
+async def _stream_users_csv(readonly=False):
+    yield "id,name,email,created_at\r\n"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    async with get_async_connection(readonly=readonly) as conn:
+        async for row in crud_user.iter_users(conn):
+            writer.writerow([row['id'], row['name'], row['email'], row['created_at'].isoformat()])
+            # STREAM_CHUNK_SIZE만큼 모이면 내보냄
+            if buffer.tell() >= STREAM_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/users/me/activity", response_model=UserActivityOut)
+async def get_my_activity(user_id: int = Depends(get_current_user_id)):
+    """현재 로그인한 사용자의 로그인 횟수, 마지막 로그인/접속 시각 (아직 DB에 쓰지 않은 기록도 합쳐서)"""
+    async with get_async_connection() as conn:
+        saved = await crud_activity.get_activity(conn, user_id)
+    saved = saved or {"login_count": 0, "last_login_at": None, "last_seen_at": None}
+    pending = activity.pending(user_id)
+    if pending is None:
+        return saved
+    return {
+        "login_count": saved['login_count'] + pending['login_count'],
+        "last_login_at": pending['last_login_at'] or saved['last_login_at'],
+        "last_seen_at": pending['last_seen_at'],
+    }
+
+
+@router.get("/users/batch", response_model=UserBatchOut)
+async def get_users_batch(request: Request, response: Response, ids: str = Query(..., description="쉼표로 구분한 회원 id (예: 1,2,3)")):
+    """
+    여러 회원을 한 번에 조회 (GET /users/{user_id}를 N번 호출하는 대신)
+    id가 많으면 POST /users/batch {"ids": [...]} 사용 (URL 길이 제한)
+    """
+    try:
+        user_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids는 쉼표로 구분한 숫자여야 합니다.")
+    if not user_ids or len(user_ids) > USER_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"ids는 1~{USER_BATCH_MAX}개까지 가능합니다.")
+    return await _users_batch_response(request, response, user_ids)
+
+
+@router.post("/users/batch", response_model=UserBatchOut)
+async def post_users_batch(request: Request, response: Response, body: UserBatchRequest):
+    """여러 회원을 한 번에 조회 (id가 많을 때, 최대 USER_BATCH_MAX개)"""
+    return await _users_batch_response(request, response, body.ids)
+
+
+async def _users_batch_response(request, response, user_ids):
+    # 캐시에 있는 회원은 바로, 나머지는 WHERE id IN (...) 몇 번으로 (USER_BATCH_CHUNK개씩)
+    user_ids = list(dict.fromkeys(user_ids))
+    found = await user_loader(request).load_many(user_ids)
+    result = {
+        "users": [user for user in found if user is not None],
+        "not_found": [user_id for user_id, user in zip(user_ids, found) if user is None],
+    }
+    if FAST_JSON:
+        result["users"] = [user_json.to_dict(user) for user in result["users"]]
+        return FastJSONResponse(user_batch_json.dumps(result), headers={"Cache-Control": "private, no-cache"})
+    response.headers["Cache-Control"] = "private, no-cache"
+    return result
+
 
 @router.get("/users/{user_id}", response_model=UserOut)
-def get_user(user_id: int):
-    """특정 사용자 조회"""
-    conn = get_connection()
+async def get_user(request: Request, response: Response, user_id: int):
+    """특정 사용자 조회 (ETag/If-None-Match 지원)"""
     try:
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT id, name, email, created_at FROM users WHERE id=%s",
-                (user_id,)
-            )
-            user = cursor.fetchone()
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-        return user
+        return await _conditional_user_response(request, response, user_id)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
-    finally:
-        conn.close()
 
 
 @router.post("/users", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate):
+async def create_user(request: Request, user: UserCreate):
     """새 사용자 생성"""
-    conn = get_connection()
+    # 캐시에 있는 이메일이면 DB까지 가지 않고 바로 거절
+    if user_cache.is_email_registered(user.email):
+        raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다.")
+
+    # 비밀번호 해싱 (DB 커넥션을 잡기 전에 먼저 처리)
+    hashed_pw = await password_service.hash_password(user.password)
+
+    # 사용자 생성: 이메일 중복 체크는 users.email UNIQUE 인덱스가 담당 (SELECT 후 INSERT 경쟁 상태 없음)
+    now = datetime.now()
     try:
-        with conn.cursor() as cursor:
-            # 이메일 중복 체크
-            cursor.execute("SELECT id FROM users WHERE email=%s", (user.email,))
-            if cursor.fetchone():
-                raise HTTPException(
-                    status_code=400,
-                    detail="이미 등록된 이메일입니다."
-                )
-            
-            # 비밀번호 해싱
-            hashed_pw = bcrypt.hashpw(
-                user.password.encode('utf-8'),
-                bcrypt.gensalt()
+        async with get_async_connection() as conn:
+            user_id = await crud_user.insert_user(
+                conn, user.name, user.email, hashed_pw, now
             )
-            
-            # 사용자 생성
-            now = datetime.now()
-            sql = """
-                INSERT INTO users (name, email, password, created_at)
-                VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(
-                sql,
-                (user.name, user.email, hashed_pw.decode('utf-8'), now)
-            )
-            conn.commit()
-            user_id = cursor.lastrowid
-            
-        return {
-            "id": user_id,
-            "name": user.name,
-            "email": user.email,
-            "created_at": now
-        }
-    except HTTPException:
-        raise
+            await conn.commit()
     except Exception as e:
-        conn.rollback()
+        if is_duplicate_key_error(e):
+            raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다.")
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
-    finally:
-        conn.close()
+    await user_cache.invalidate_user(user_id, user.email)
+    mark_write(request.session)
+
+    return {
+        "id": user_id,
+        "name": user.name,
+        "email": user.email,
+        "created_at": now
+    }
 
 
 # PATCH와 PUT을 통합 (실제 로직은 동일하므로)
 @router.put("/users/me", response_model=UserOut)
 @router.patch("/users/me", response_model=UserOut)
-def update_my_info(
+async def update_my_info(
+    request: Request,
     user: UserUpdate,
     user_id: int = Depends(get_current_user_id)
 ):
@@ -135,140 +303,104 @@ def update_my_info(
     내 정보 수정
     - 세션에서 자동으로 user_id 추출
     - 비밀번호는 선택적
+    - 보낸 필드만 UPDATE 한 번으로 수정 (이메일 중복은 UNIQUE 인덱스 위반으로 판단)
     """
-    conn = get_connection()
+    # 업데이트할 필드가 하나도 없으면 에러
+    if not any([user.name, user.email, user.password]):
+        raise HTTPException(
+            status_code=400,
+            detail="최소 하나의 필드는 업데이트해야 합니다."
+        )
     try:
-        with conn.cursor() as cursor:
-            # 현재 정보 조회
-            cursor.execute(
-                "SELECT id, name, email, created_at FROM users WHERE id=%s",
-                (user_id,)
-            )
-            current_user = cursor.fetchone()
-            if not current_user:
-                raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-            
-            # 업데이트할 필드가 하나도 없으면 에러
-            if not any([user.name, user.email, user.password]):
-                raise HTTPException(
-                    status_code=400,
-                    detail="최소 하나의 필드는 업데이트해야 합니다."
-                )
-            
-            # 업데이트할 값 준비
-            new_name = user.name if user.name is not None else current_user['name']
-            new_email = user.email if user.email is not None else current_user['email']
-            
-            # 이메일 변경 시 중복 체크
-            if new_email != current_user['email']:
-                cursor.execute(
-                    "SELECT id FROM users WHERE email=%s AND id!=%s",
-                    (new_email, user_id)
-                )
-                if cursor.fetchone():
-                    raise HTTPException(
-                        status_code=400,
-                        detail="이미 등록된 이메일입니다."
-                    )
-            
-            # SQL 쿼리 동적 생성
-            update_fields = ["name=%s", "email=%s"]
-            update_values = [new_name, new_email]
-            
-            # 비밀번호가 제공된 경우에만 업데이트
-            if user.password is not None:
-                hashed_pw = bcrypt.hashpw(
-                    user.password.encode('utf-8'),
-                    bcrypt.gensalt()
-                )
-                update_fields.append("password=%s")
-                update_values.append(hashed_pw.decode('utf-8'))
-            
-            update_values.append(user_id)
-            
-            # 업데이트 실행
-            sql = f"UPDATE users SET {', '.join(update_fields)} WHERE id=%s"
-            cursor.execute(sql, tuple(update_values))
-            conn.commit()
-            
+        # 현재 정보 (응답의 created_at, 캐시 무효화할 이전 이메일용). 보통 캐시에서 바로 나옴
+        current_user = await user_cache.get_user(user_id)
+        if not current_user:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
+        fields = {}
+        if user.name is not None:
+            fields["name"] = user.name
+        if user.email is not None:
+            fields["email"] = user.email
+        # 비밀번호가 제공된 경우에만 업데이트
+        if user.password is not None:
+            fields["password"] = await password_service.hash_password(user.password)
+        fields["updated_at"] = datetime.now()
+
+        async with get_async_connection() as conn:
+            matched = await crud_user.update_user(conn, user_id, fields)
+            await conn.commit()
+        await user_cache.invalidate_user(user_id, current_user['email'], user.email)
+        mark_write(request.session)
+        if matched == 0:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
         return {
             "id": user_id,
-            "name": new_name,
-            "email": new_email,
+            "name": fields.get("name", current_user['name']),
+            "email": fields.get("email", current_user['email']),
             "created_at": current_user['created_at']
         }
     except HTTPException:
         raise
     except Exception as e:
-        conn.rollback()
+        if is_duplicate_key_error(e):
+            raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다.")
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
-    finally:
-        conn.close()
 
 @router.put("/users/{user_id}", response_model=UserOut)
-def update_user_by_id(user_id: int, user: UserUpdate):
-    """사용자 정보 필드를 모두 수정"""
-    conn = get_connection()
+async def update_user_by_id(request: Request, user_id: int, user: UserUpdate):
+    """사용자 정보 수정 (보낸 필드만, 비밀번호는 선택적)"""
+    if not any([user.name, user.email, user.password]):
+        raise HTTPException(
+            status_code=400,
+            detail="최소 하나의 필드는 업데이트해야 합니다."
+        )
     try:
-        with conn.cursor() as cursor:
-            # 다른 사용자가 사용 중인 이메일인지 체크
-            cursor.execute(
-                "SELECT id FROM users WHERE email=%s AND id!=%s",
-                (user.email, user_id)
-            )
-            if cursor.fetchone():
-                raise HTTPException(
-                    status_code=400,
-                    detail="이미 등록된 이메일입니다."
-                )
-            
-            # 기존 created_at 조회
-            cursor.execute(
-                "SELECT created_at FROM users WHERE id=%s",
-                (user_id,)
-            )
-            result = cursor.fetchone()
-            if not result:
-                raise HTTPException(status_code=404, detail="User not found")
-            
-            created_at = result['created_at']
-            
-            # 비밀번호 해싱
-            hashed_pw = bcrypt.hashpw(
-                user.password.encode('utf-8'),
-                bcrypt.gensalt()
-            )
-            
-            # 사용자 정보 업데이트
-            sql = """
-                UPDATE users
-                SET name=%s, email=%s, password=%s
-                WHERE id=%s
-            """
-            cursor.execute(
-                sql,
-                (user.name, user.email, hashed_pw.decode('utf-8'), user_id)
-            )
-            conn.commit()
-            
+        # 기존 created_at, 이전 이메일 조회 (캐시)
+        result = await user_cache.get_user(user_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        created_at = result['created_at']
+
+        fields = {}
+        if user.name is not None:
+            fields["name"] = user.name
+        if user.email is not None:
+            fields["email"] = user.email
+        # 비밀번호가 제공된 경우에만 해싱해서 업데이트
+        if user.password is not None:
+            fields["password"] = await password_service.hash_password(user.password)
+        fields["updated_at"] = datetime.now()
+
+        # 사용자 정보 업데이트 (이메일 중복은 UNIQUE 인덱스가 막아줌)
+        async with get_async_connection() as conn:
+            matched = await crud_user.update_user(conn, user_id, fields)
+            await conn.commit()
+        await user_cache.invalidate_user(user_id, result['email'], user.email)
+        mark_write(request.session)
+        if matched == 0:
+            raise HTTPException(status_code=404, detail="User not found")
+
         return {
             "id": user_id,
-            "name": user.name,
-            "email": user.email,
+            "name": fields.get("name", result['name']),
+            "email": fields.get("email", result['email']),
             "created_at": created_at  # 원래 생성일 유지
         }
     except HTTPException:
         raise
     except Exception as e:
-        conn.rollback()
+        if is_duplicate_key_error(e):
+            raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다.")
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
-    finally:
-        conn.close()
 
 from fastapi import Body
 
 @router.delete("/users/me", status_code=status.HTTP_204_NO_CONTENT)
-def delete_my_account(
+async def delete_my_account(
+    request: Request,
     password: str = Body(..., embed=True),
     user_id: int = Depends(get_current_user_id)
 ):
@@ -277,26 +409,25 @@ def delete_my_account(
     - 세션에서 user_id 추출
     - 비밀번호 일치 시에만 삭제
     """
-    conn = get_connection()
     try:
-        with conn.cursor() as cursor:
-            # 1. 현재 비밀번호 해시 조회
-            cursor.execute("SELECT password FROM users WHERE id=%s", (user_id,))
-            user = cursor.fetchone()
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-            # 2. 비밀번호 검증
-            if not bcrypt.checkpw(password.encode('utf-8'), user['password'].encode('utf-8')):
-                raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
-            # 3. 삭제
-            cursor.execute("DELETE FROM users WHERE id=%s", (user_id,))
-            conn.commit()
-            if cursor.rowcount == 0:
-                raise HTTPException(status_code=404, detail="User not found")
+        # 1. 현재 비밀번호 해시 조회
+        async with get_async_connection() as conn:
+            current_user = await crud_user.get_user_with_password(conn, user_id)
+        if not current_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        # 2. 비밀번호 검증 (bcrypt는 수백 ms 걸리므로 DB 커넥션을 반납한 상태에서)
+        matched = await password_service.verify_password(password, current_user['password'])
+        if not matched:
+            raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
+        # 3. 삭제
+        async with get_async_connection() as conn:
+            deleted = await crud_user.delete_user(conn, user_id)
+            await conn.commit()
+        await user_cache.invalidate_user(user_id, current_user['email'])
+        mark_write(request.session)
+        if deleted == 0:
+            raise HTTPException(status_code=404, detail="User not found")
     except HTTPException:
         raise
     except Exception as e:
-        conn.rollback()
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
-    finally:
-        conn.close()
\ No newline at end of file
@@ -0,0 +1,215 @@
+# 정적 파일(app/static) 빌드 + 서빙
+# - build(): 파일 내용 해시를 넣은 이름(style.css -> style.1a2b3c4d5e6f.css)으로 복사하고
+#            .gz (그리고 brotli 패키지가 있으면 .br) 미리 압축본과 manifest.json 을 ASSET_BUILD_DIR 에 만든다.
+# - 템플릿에서는 {{ asset_url('style.css') }} 로 해시가 들어간 주소를 쓴다.
+#   내용이 바뀌면 주소도 바뀌므로 브라우저가 1년 동안 다시 묻지 않도록(immutable) 캐시해도 안전하다.
+# - StaticAssets: /static 에 마운트되는 ASGI 앱. Accept-Encoding에 따라 br/gzip/원본 중 골라서
+#   메모리에 올려 둔 bytes로 바로 응답한다 (큰 파일은 디스크에서 스트리밍).
+#
+# 실행 방법) 배포 전에 미리 빌드 (서버는 ASSET_BUILD_ON_STARTUP=1(기본)이면 시작할 때 자동 빌드)
+#   python -m app.core.assets
+# 멀티 워커 실행기(app/launcher.py)는 fork 전에 부모에서 한 번 빌드하고, 워커는 load()만 한다.
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+from app.core.compression import accepted_encodings
+from app.core.conditional import etag_matches, not_modified
+
+try:
+    import brotli  # 선택 의존성 (없으면 gzip만)
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "app/static"
+ASSET_BUILD_DIR = os.getenv('ASSET_BUILD_DIR', '.assets')
+ASSET_BUILD_ON_STARTUP = os.getenv('ASSET_BUILD_ON_STARTUP', '1') == '1'
+# 이 크기 이하의 파일은 메모리에 올려서 응답 (바이트)
+ASSET_MEMORY_MAX = int(os.getenv('ASSET_MEMORY_MAX', str(1024 * 1024)))
+# 이보다 작은 파일은 압축해도 이득이 거의 없음
+MIN_COMPRESS_SIZE = 256
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+# 원래 이름 -> 해시가 들어간 이름
+_manifest = {}
+# 요청 경로(원래 이름 또는 해시 이름) -> Asset
+_assets = {}
+
+
+def _fingerprinted_name(name, digest):
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest[:12]}{ext}"
+
+
+def _write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 임시 파일에 다 쓴 뒤 rename: 동시에 빌드/로드하는 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def build(src=STATIC_DIR, out=ASSET_BUILD_DIR):
+    """src의 모든 파일을 해시 이름 + 압축본으로 out에 만들고 manifest(dict)를 반환"""
+    manifest = {}
+    for root, _, files in os.walk(src):
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, src).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                data = f.read()
+            hashed = _fingerprinted_name(name, hashlib.sha256(data).hexdigest())
+            manifest[name] = hashed
+            target = os.path.join(out, hashed)
+            _write_if_changed(target, data)
+            if len(data) >= MIN_COMPRESS_SIZE and _compressible(name):
+                # mtime=0: 같은 내용이면 항상 같은 .gz 가 나오도록
+                _write_if_changed(target + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _write_if_changed(target + ".br", brotli.compress(data, quality=11))
+    _write_if_changed(os.path.join(out, "manifest.json"),
+                      json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def _compressible(name):
+    content_type = mimetypes.guess_type(name)[0] or ""
+    return (content_type.startswith("text/")
+            or content_type in ("application/javascript", "application/json", "image/svg+xml"))
+
+
+class Asset:
+    """파일 하나의 응답 정보 (인코딩별 내용: None=원본, "br", "gzip")"""
+
+    def __init__(self, path, content_type, etag, cache_control):
+        self.path = path
+        self.content_type = content_type
+        self.etag = etag
+        self.cache_control = cache_control
+        self.files = {}    # 인코딩 -> 파일 경로
+        self.bodies = {}   # 인코딩 -> bytes (ASSET_MEMORY_MAX 이하만)
+
+    def add(self, encoding, path):
+        self.files[encoding] = path
+        if os.path.getsize(path) <= ASSET_MEMORY_MAX:
+            with open(path, 'rb') as f:
+                self.bodies[encoding] = f.read()
+
+
+def load(out=ASSET_BUILD_DIR):
+    """빌드 결과(manifest.json)를 읽어서 서빙 테이블 준비"""
+    global _manifest, _assets
+    with open(os.path.join(out, "manifest.json"), encoding='utf-8') as f:
+        manifest = json.load(f)
+    assets = {}
+    for name, hashed in manifest.items():
+        path = os.path.join(out, hashed)
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        etag = '"' + hashed.rsplit('.', 2)[-2] + '"' if hashed.count('.') >= 2 else None
+        # 해시 이름은 내용이 바뀌면 주소도 바뀌므로 영구 캐시, 원래 이름은 매번 ETag로 재검증
+        for request_name, cache_control in ((hashed, IMMUTABLE), (name, REVALIDATE)):
+            asset = Asset(path, content_type, etag, cache_control)
+            asset.add(None, path)
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+                if os.path.exists(path + suffix):
+                    asset.add(encoding, path + suffix)
+            assets["/" + request_name] = asset
+    _manifest, _assets = manifest, assets
+    return manifest
+
+
+def init_assets():
+    """서버 시작 시 호출: (설정에 따라) 빌드 후 로드. 빌드 결과가 없으면 원본 파일을 그대로 서빙"""
+    if ASSET_BUILD_ON_STARTUP:
+        build()
+    if os.path.exists(os.path.join(ASSET_BUILD_DIR, "manifest.json")):
+        load()
+
+
+def asset_url(name):
+    """템플릿용: 해시 이름이 들어간 주소 (빌드 전이면 원래 주소)"""
+    return "/static/" + _manifest.get(name, name)
+
+
+class StaticAssets:
+    """/static 마운트용 ASGI 앱. 빌드된 파일은 직접 응답하고, 나머지는 StaticFiles로 넘긴다."""
+
+    def __init__(self, directory=STATIC_DIR):
+        self.fallback = StaticFiles(directory=directory)
+
+    async def __call__(self, scope, receive, send):
+        asset = _assets.get(_route_path(scope)) if scope["type"] == "http" else None
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            await self.fallback(scope, receive, send)
+            return
+        response = self._response(scope, asset)
+        await response(scope, receive, send)
+
+    def _response(self, scope, asset):
+        request = Request(scope)
+        headers = {"Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+        accepted = accepted_encodings(request.headers)
+        encoding = next((coding for coding in ("br", "gzip") if coding in asset.files and coding in accepted), None)
+        if asset.etag:
+            # 강한 ETag는 인코딩마다 달라야 함 (RFC 9110): "해시", "해시-br", "해시-gz"
+            headers["ETag"] = _encoded_etag(asset.etag, encoding)
+            # 다른 인코딩으로 받아 둔 같은 내용이어도 304
+            if etag_matches(request, *[_encoded_etag(asset.etag, coding) for coding in asset.files]):
+                return not_modified(headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        body = asset.bodies.get(encoding)
+        if body is None:
+            return FileResponse(asset.files[encoding], media_type=asset.content_type, headers=headers,
+                                method=scope["method"])
+        if scope["method"] == "HEAD":
+            response = Response(media_type=asset.content_type, headers=headers)
+            response.headers["Content-Length"] = str(len(body))
+            return response
+        return Response(body, media_type=asset.content_type, headers=headers)
+
+
+_ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+def _encoded_etag(etag, encoding):
+    suffix = _ETAG_SUFFIXES.get(encoding)
+    return etag[:-1] + suffix + '"' if suffix else etag
+
+
+def _route_path(scope):
+    # 마운트된 경우 root_path("/static")를 뺀 나머지 경로
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        return path[len(root_path):]
+    return path
+
+
+if __name__ == "__main__":
+    result = build()
+    print(f"{ASSET_BUILD_DIR}/ 에 {len(result)}개 파일 빌드" + ("" if brotli else " (brotli 미설치: gzip만)"))
+    for name, hashed in result.items():
+        print(f"  {name} -> {hashed}")
@@ -0,0 +1,135 @@
+# 캐시 유틸리티
+# - TTLCache: 프로세스 내 LRU + TTL 캐시 (스레드 안전)
+# - 공유 캐시 백엔드: 워커가 여러 개일 때 워커끼리 같은 캐시를 보도록 하는 2차 캐시
+#   (CACHE_BACKEND=memory 는 테스트용 로컬 대체품, CACHE_BACKEND=redis 는 redis 패키지 필요)
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+_MISSING = object()
+
+
+class TTLCache:
+    """최대 maxsize개까지 저장하고, 가장 오래 안 쓴 항목부터 버리는 LRU 캐시. 항목마다 ttl(초) 후 만료"""
+
+    def __init__(self, maxsize=10000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (만료 시각, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"JSON으로 변환할 수 없는 타입: {type(value)}")
+
+
+class MemorySharedBackend:
+    """
+    공유 캐시 백엔드의 로컬 대체품 (테스트/단일 워커용)
+    redis 백엔드와 같은 async 인터페이스를 제공한다.
+    """
+
+    def __init__(self, maxsize=100000):
+        self._cache = TTLCache(maxsize=maxsize)
+
+    async def get(self, key):
+        return self._cache.get(key)
+
+    async def set(self, key, value, ttl):
+        # 실제 공유 백엔드처럼 직렬화된 값을 저장 (같은 dict 객체를 공유하지 않도록)
+        self._cache.set(key, json.loads(json.dumps(value, default=_json_default)), ttl)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self._cache.delete(key)
+
+
+class RedisSharedBackend:
+    """redis 공유 캐시 백엔드 (pip install redis 필요)"""
+
+    def __init__(self, url, prefix="eduapp:"):
+        import redis.asyncio as redis  # 선택 의존성
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key):
+        raw = await self._redis.get(self._prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key, value, ttl):
+        await self._redis.set(self._prefix + key, json.dumps(value, default=_json_default), ex=int(ttl))
+
+    async def delete(self, *keys):
+        if keys:
+            await self._redis.delete(*[self._prefix + key for key in keys])
+
+
+_shared_backend = _MISSING
+
+
+def get_shared_backend():
+    """CACHE_BACKEND 환경변수에 따라 공유 캐시 백엔드 반환 (설정 없으면 None)"""
+    global _shared_backend
+    if _shared_backend is _MISSING:
+        kind = os.getenv('CACHE_BACKEND', '').lower()
+        if kind == 'redis':
+            _shared_backend = RedisSharedBackend(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+        elif kind == 'memory':
+            _shared_backend = MemorySharedBackend()
+        else:
+            _shared_backend = None
+    return _shared_backend
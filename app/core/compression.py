@@ -0,0 +1,186 @@
+# 응답 압축 미들웨어 (gzip, brotli 패키지가 있으면 br)
+# - Accept-Encoding에 따라 br -> gzip 순으로 고르고, 작은 응답(COMPRESS_MIN_SIZE 미만)은 그대로 보낸다.
+# - 이미 압축된 응답(Content-Encoding이 있는 정적 파일 등)과 압축 효과가 없는 형식(이미지, zip 등)은 건너뛴다.
+# - 스트리밍 응답(NDJSON 내보내기, 회원목록 페이지)은 조각 단위로 압축해서 흘려보내므로 전체 응답을 메모리에 모으지 않는다.
+#   flush(압축기가 가진 데이터를 내보냄)는 첫 조각과 COMPRESS_FLUSH_SIZE 바이트마다만 한다.
+#   조각마다 flush 하면 압축률이 떨어지고 작은 send가 많아진다. 첫 조각은 바로 보내서 브라우저가 head부터 그리게 한다.
+# - 압축률/압축 시간은 app/core/metrics.py 의 히스토그램에 기록 (/metrics)
+# COMPRESSION_ENABLED=0 이면 미들웨어를 붙이지 않는다.
+import os
+import time
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core import metrics
+
+try:
+    import brotli  # 선택 의존성 (없으면 gzip만)
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', '1') == '1'
+# 이보다 작은 응답은 압축하지 않음 (헤더/CPU 비용이 더 큼)
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '500'))
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+# brotli 최고 품질(11)은 너무 느려서 응답마다 쓰기 어렵다. 미리 압축하는 정적 파일만 11 사용
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+# 스트리밍 응답에서 압축 전 데이터가 이만큼 모일 때마다 flush
+COMPRESS_FLUSH_SIZE = int(os.getenv('COMPRESS_FLUSH_SIZE', str(32 * 1024)))
+
+# 압축하는 Content-Type (나머지는 이미 압축된 형식으로 보고 건너뜀)
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml",
+)
+
+_stats = {"compressed": 0, "skipped_small": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def accepted_encodings(headers):
+    """요청 헤더의 Accept-Encoding에서 받을 수 있는 인코딩 집합 (q=0 은 제외)"""
+    accepted = set()
+    for item in headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self):
+        # wbits=31: zlib 대신 gzip 헤더/트레일러
+        self._compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data, flush):
+        # Z_SYNC_FLUSH: 지금까지 받은 데이터를 바로 내보냄 (flush=False면 압축기 안에 모아 둠)
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data=b""):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+
+    def compress(self, data, flush):
+        out = self._compressor.process(data)
+        return out + self._compressor.flush() if flush else out
+
+    def finish(self, data=b""):
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _choose_encoder(accepted):
+    if brotli is not None and "br" in accepted:
+        return _BrotliEncoder
+    if "gzip" in accepted:
+        return _GzipEncoder
+    return None
+
+
+def _compressible(headers):
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """응답 본문 압축 (순수 ASGI 미들웨어, 스트리밍 응답도 조각 단위로 압축)"""
+
+    def __init__(self, app, minimum_size=COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoder_class = _choose_encoder(accepted_encodings(Headers(scope=scope)))
+        if encoder_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+        bytes_in = bytes_out = 0
+        unflushed = 0   # 마지막 flush 이후 압축기에 넣은 바이트 수
+        elapsed = 0.0
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough, bytes_in, bytes_out, unflushed, elapsed
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # 첫 본문 조각을 보고 압축 여부를 정하므로 헤더는 잠시 보류
+                start_message = message
+                if message["status"] < 200 or message["status"] in (204, 304) \
+                        or not _compressible(Headers(raw=message["headers"])):
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # 한 번에 끝나는 작은 응답은 그대로
+                    _stats["skipped_small"] += 1
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = encoder_class()
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["content-length"]
+                # 압축된 표현은 원본과 바이트가 다르므로 강한 ETag는 약한 ETag로
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                await send(start_message)
+
+            started = time.perf_counter()
+            if more_body:
+                # 첫 조각(bytes_in == 0)은 바로 flush, 이후에는 COMPRESS_FLUSH_SIZE만큼 모일 때마다
+                unflushed += len(body)
+                flush = bytes_in == 0 or unflushed >= COMPRESS_FLUSH_SIZE
+                if flush:
+                    unflushed = 0
+                data = encoder.compress(body, flush)
+            else:
+                data = encoder.finish(body)
+            elapsed += time.perf_counter() - started
+            bytes_in += len(body)
+            bytes_out += len(data)
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+            if not more_body:
+                _stats["compressed"] += 1
+                _stats["bytes_in"] += bytes_in
+                _stats["bytes_out"] += bytes_out
+                metrics.record_compression(encoder.name, bytes_in, bytes_out, elapsed)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def compression_stats():
+    ratio = _stats["bytes_out"] / _stats["bytes_in"] if _stats["bytes_in"] else None
+    return {**_stats, "ratio": ratio, "brotli": brotli is not None}
@@ -0,0 +1,18 @@
+# 조건부 GET (ETag / If-None-Match) 공통 함수
+# 브라우저/클라이언트가 전에 받은 ETag를 If-None-Match로 보내고, 지금 ETag와 같으면 본문 없이 304로 응답한다.
+from starlette.responses import Response
+
+
+def etag_matches(request, *etags):
+    """If-None-Match 헤더에 etags 중 하나라도 있으면 True (약한 비교: W/ 접두어는 무시)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # 여러 개(콤마 구분)나 약한 ETag(W/"...")로 올 수도 있음
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or any(etag.removeprefix("W/") in candidates for etag in etags)
+
+
+def not_modified(headers):
+    """304 응답 (ETag, Cache-Control 등 헤더는 200일 때와 같게 보낸다)"""
+    return Response(status_code=304, headers=headers)
@@ -1,8 +1,12 @@
 # 환경설정 및 환경변수 관리
+# .env 로드는 여기서 한 번만 한다 (app.core.db, app.launcher 등은 이 모듈을 import)
+import logging
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def get_db_url():
-	return os.getenv("DB_URL")
+# DB 접속 정보는 MYSQL_* 환경변수로만 정한다 (동기/비동기 풀, SQLAlchemy 엔진 모두 app.core.db 설정을 사용)
+if os.getenv("DB_URL"):
+	logging.getLogger(__name__).warning(
+		"DB_URL은 더 이상 사용하지 않습니다 (무시됨). MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DB로 설정하세요.")
@@ -1,11 +1,46 @@
-# DB 연결 관리 (MySQL)
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-
-load_dotenv()
-DB_URL = os.getenv("DB_URL")
-engine = create_engine(DB_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-#SessionLocal()은 SQLAlchemy의 세션 팩토리로, 데이터베이스와의 세션(연결)을 생성하는 역할을 한다.
\ No newline at end of file
+# DB 연결 관리 (SQLAlchemy 세션)
+# SQLAlchemy 자체 풀은 만들지 않고 app.core.db 의 동기(pymysql) 커넥션 풀(get_pool)을 같이 쓴다.
+# async 라우터가 쓰는 비동기(aiomysql) 풀과는 별개의 풀이다. 두 풀 모두 lifespan(db.startup/shutdown)에서 준비/정리.
+# - creator: app.core.db 동기 풀에서 커넥션을 빌려줌, NullPool: 세션이 끝나면 바로 동기 풀에 반납
+# - 접속 정보도 app.core.db 와 같은 MYSQL_* 환경변수를 사용
+# - 엔진은 처음 세션을 만들 때 생성 (import만 해서는 DB에 접속하지 않고, sqlalchemy도 불러오지 않음)
+import threading
+
+from app.core.db import PooledConnection, TupleCursor, get_pool
+
+_engine = None
+_session_factory = None
+_lock = threading.Lock()
+
+
+class _SQLAlchemyConnection(PooledConnection):
+    """풀 커넥션의 기본 커서(DictCursor) 대신 튜플 커서를 쓰는 래퍼 (SQLAlchemy는 튜플 행을 기대함)"""
+
+    def cursor(self, cursor=None):
+        return self.__getattr__("cursor")(cursor or TupleCursor)
+
+
+def _connect():
+    pool = get_pool()
+    return _SQLAlchemyConnection(pool, pool.acquire())
+
+
+def get_engine():
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                from sqlalchemy.orm import sessionmaker
+                from sqlalchemy.pool import NullPool
+                engine = create_engine("mysql+pymysql://", creator=_connect, poolclass=NullPool)
+                _session_factory = sessionmaker(autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def SessionLocal():
+    """SQLAlchemy 세션 생성 (app.deps.get_db 에서 사용)"""
+    get_engine()
+    return _session_factory()
+#SessionLocal()은 SQLAlchemy의 세션 팩토리로, 데이터베이스와의 세션(연결)을 생성하는 역할을 한다.
@@ -1,17 +1,691 @@
 import pymysql
+import aiomysql
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pymysql.constants import CLIENT, SERVER_STATUS
+from app.core import config  # noqa: F401  (.env 로드는 config에서 한 번만)
+from app.core import metrics
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-def get_connection():
-    return pymysql.connect(
+
+def _connect_kwargs():
+    return dict(
         host=os.getenv('MYSQL_HOST', 'localhost'),
+        port=int(os.getenv('MYSQL_PORT', '3306')),
         user=os.getenv('MYSQL_USER', 'scott'),
         password=os.getenv('MYSQL_PASSWORD', 'tiger'),
         db=os.getenv('MYSQL_DB', 'eduDB'),
         charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
+        # UPDATE의 rowcount를 "바뀐 행 수"가 아니라 "WHERE에 맞은 행 수"로 받기 위해 사용
+        # (값이 같아서 안 바뀐 경우도 존재하는 사용자로 판단)
+        client_flag=CLIENT.FOUND_ROWS,
+    )
+
+
+ER_DUP_ENTRY = 1062
+
+
+def is_duplicate_key_error(exc):
+    """UNIQUE 인덱스 위반(Duplicate entry) 에러인지 확인"""
+    return (isinstance(exc, pymysql.err.IntegrityError)
+            and bool(exc.args) and exc.args[0] == ER_DUP_ENTRY)
+
+
+# 쿼리 실행 시간을 metrics에 기록하는 커서 (METRICS_ENABLED=0 이면 기본 커서 사용)
+class _TimedCursorMixin:
+    def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            metrics.record_db_query(time.perf_counter() - start)
+
+
+class TimedDictCursor(_TimedCursorMixin, pymysql.cursors.DictCursor):
+    pass
+
+
+class TimedCursor(_TimedCursorMixin, pymysql.cursors.Cursor):
+    pass
+
+
+class _AsyncTimedCursorMixin:
+    async def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, args)
+        finally:
+            metrics.record_db_query(time.perf_counter() - start)
+
+
+class AsyncTimedDictCursor(_AsyncTimedCursorMixin, aiomysql.DictCursor):
+    pass
+
+
+class AsyncTimedSSDictCursor(_AsyncTimedCursorMixin, aiomysql.SSDictCursor):
+    pass
+
+
+DictCursor = TimedDictCursor if metrics.ENABLED else pymysql.cursors.DictCursor
+# 행을 튜플로 돌려주는 커서 (SQLAlchemy용, app/core/database.py)
+TupleCursor = TimedCursor if metrics.ENABLED else pymysql.cursors.Cursor
+AsyncDictCursor = AsyncTimedDictCursor if metrics.ENABLED else aiomysql.DictCursor
+# 서버 사이드(unbuffered) 커서: 결과를 한 번에 받지 않고 조금씩 읽을 때 사용
+AsyncSSDictCursor = AsyncTimedSSDictCursor if metrics.ENABLED else aiomysql.SSDictCursor
+
+
+def _connect():
+    return pymysql.connect(
+        cursorclass=DictCursor,
+        **_connect_kwargs()
     )
 #utf8mb4 ==> 이모지 같은 문자와 확장된 유니코드 문자도 저장가능
 # most bytes 4 (즉 4바이트 지원)
+
+
+class PoolTimeout(Exception):
+    """풀에서 정해진 시간 안에 커넥션을 얻지 못한 경우"""
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 pymysql 커넥션 풀
+    - minsize: 항상 유지할 최소 커넥션 수
+    - maxsize: 동시에 열 수 있는 최대 커넥션 수 (초과 요청은 대기)
+    - idle_timeout: 이 시간(초) 이상 놀고 있던 커넥션은 닫음
+    - ping_after: 이 시간(초) 이상 놀고 있던 커넥션은 꺼낼 때 ping으로 살아있는지 확인
+    """
+
+    def __init__(self, connect, minsize=1, maxsize=10, idle_timeout=300,
+                 ping_after=10, acquire_timeout=10):
+        self._connect = connect
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.acquire_timeout = acquire_timeout
+        self._idle = deque()  # (conn, 마지막 사용 시각)
+        self._size = 0  # 풀이 관리 중인 전체 커넥션 수 (사용중 + 대기중)
+        self._cond = threading.Condition()
+        self._closed = False
+        # 통계
+        self._acquired_total = 0
+        self._created_total = 0
+        self._discarded_total = 0
+        self._timeouts_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._waiting = 0
+
+    def acquire(self):
+        """풀에서 커넥션을 하나 꺼낸다. 없으면 새로 만들거나 반납될 때까지 대기"""
+        start = time.monotonic()
+        deadline = start + self.acquire_timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("커넥션 풀이 이미 닫혔습니다.")
+                    self._evict_idle()
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.maxsize:
+                        self._size += 1  # 자리 예약 후 락 밖에서 접속
+                        conn, last_used = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts_total += 1
+                        raise PoolTimeout("DB 커넥션 풀 대기 시간 초과")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+        try:
+            if conn is None:
+                conn = self._new_connection()
+            elif time.monotonic() - last_used >= self.ping_after:
+                conn = self._checked(conn)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - start
+        metrics.record_pool_wait(waited)
+        with self._cond:
+            self._acquired_total += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        return conn
+
+    def release(self, conn):
+        """커넥션을 풀에 반납한다. 열린 트랜잭션은 rollback으로 정리"""
+        healthy = conn.open
+        if healthy and conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            try:
+                conn.rollback()
+            except Exception:
+                healthy = False
+        with self._cond:
+            if healthy and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._size -= 1
+                self._discarded_total += 1
+                self._close_quietly(conn)
+            self._cond.notify()
+
+    def close(self):
+        """대기중인 커넥션을 모두 닫는다 (사용중인 커넥션은 반납될 때 닫힘)"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close_quietly(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            acquired = self._acquired_total
+            return {
+                "size": self._size,
+                "in_use": self._size - idle,
+                "idle": idle,
+                "waiting": self._waiting,
+                "minsize": self.minsize,
+                "maxsize": self.maxsize,
+                "acquired_total": acquired,
+                "created_total": self._created_total,
+                "discarded_total": self._discarded_total,
+                "timeouts_total": self._timeouts_total,
+                "wait_seconds_total": round(self._wait_seconds_total, 6),
+                "wait_seconds_avg": round(self._wait_seconds_total / acquired, 6) if acquired else 0.0,
+                "wait_seconds_max": round(self._wait_seconds_max, 6),
+            }
+
+    def _new_connection(self):
+        conn = self._connect()
+        with self._cond:
+            self._created_total += 1
+        return conn
+
+    def _checked(self, conn):
+        # pre-ping: 끊어진 커넥션이면 버리고 새로 연결
+        try:
+            conn.ping(reconnect=False)
+            return conn
+        except Exception:
+            self._close_quietly(conn)
+            with self._cond:
+                self._discarded_total += 1
+            return self._new_connection()
+
+    def _evict_idle(self):
+        # 락을 잡은 상태에서 호출됨. 오래된 커넥션부터(왼쪽) 정리하되 minsize는 유지
+        now = time.monotonic()
+        while (self._idle and self._size > self.minsize
+               and now - self._idle[0][1] > self.idle_timeout):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._discarded_total += 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class PooledConnection:
+    """
+    풀에서 꺼낸 커넥션 래퍼
+    기존 코드처럼 conn.close()를 호출하면 실제로 닫지 않고 풀에 반납한다.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise pymysql.err.InterfaceError("반납된 커넥션입니다.")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect,
+                    minsize=int(os.getenv('DB_POOL_MIN', '1')),
+                    maxsize=_sync_pool_max(),
+                    idle_timeout=float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),
+                    ping_after=float(os.getenv('DB_POOL_PING_AFTER', '10')),
+                    acquire_timeout=float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10')),
+                )
+    return _pool
+
+
+def _sync_pool_max():
+    # 동기 풀은 마이그레이션/SQLAlchemy 세션(get_db)/스크립트용. 요청 처리는 비동기 풀이 담당하므로 따로 줄일 수 있음
+    return int(os.getenv('DB_SYNC_POOL_MAX', os.getenv('DB_POOL_MAX', '10')))
+
+
+def get_connection():
+    """풀에서 커넥션을 꺼내 반환. 사용 후 conn.close()로 반납"""
+    pool = get_pool()
+    return PooledConnection(pool, pool.acquire())
+
+
+def get_db_conn():
+    """
+    FastAPI 의존성 함수: 요청마다 풀에서 커넥션을 빌려주고 요청이 끝나면 반납
+    사용 예) def handler(conn = Depends(get_db_conn)): ...
+    """
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def pool_stats():
+    """풀 상태(사용중/대기중 커넥션 수, 대기 시간 등) 조회"""
+    return get_pool().stats()
+
+
+# ---------------------------------------------------------------------------
+# 비동기(async) 경로: aiomysql 커넥션 풀
+# async def 라우터에서 이벤트 루프를 막지 않고 DB를 사용하기 위한 풀
+# ---------------------------------------------------------------------------
+
+_async_pool = None
+_async_pool_lock = asyncio.Lock()
+_async_stats = {
+    "acquired_total": 0,
+    "timeouts_total": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+    "primary_fallbacks": 0,
+}
+
+
+async def _create_async_pool(**overrides):
+    return await aiomysql.create_pool(
+        minsize=int(os.getenv('DB_POOL_MIN', '1')),
+        maxsize=int(os.getenv('DB_POOL_MAX', '10')),
+        # 이 시간(초) 이상 사용되지 않은 커넥션은 꺼낼 때 새로 연결
+        pool_recycle=int(float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))),
+        cursorclass=AsyncDictCursor,
+        autocommit=False,
+        **{**_connect_kwargs(), **overrides}
+    )
+
+
+async def get_async_pool():
+    global _async_pool
+    if _async_pool is None:
+        async with _async_pool_lock:
+            if _async_pool is None:
+                _async_pool = await _create_async_pool()
+    return _async_pool
+
+
+# ---------------------------------------------------------------------------
+# 읽기 전용 복제본(replica)
+# MYSQL_REPLICA_HOSTS=host1,host2:3307 처럼 설정하면 get_async_connection(readonly=True)는
+# 정상인 복제본 중 하나(라운드로빈)에서 커넥션을 빌려준다. 접속 계정/DB 이름은 원본(primary)과 같다.
+# - 헬스체크: DB_REPLICA_CHECK_INTERVAL초마다 복제 지연(Seconds_Behind_Source)을 확인해서
+#   접속이 안 되거나 지연이 DB_REPLICA_MAX_LAG초를 넘는 복제본은 빼고, 정상인 복제본이 없으면 원본에서 읽는다.
+# - 방금 쓴 내용을 바로 읽어야 하는 경우(read-your-writes)는 호출하는 쪽에서 readonly=False로 원본을 쓴다.
+#   (세션 기준: mark_write(session) / can_use_replica(session))
+# ---------------------------------------------------------------------------
+
+DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '5'))
+# 쓰기 후 이 시간(초) 동안은 같은 세션의 읽기를 원본에서 (기본: 허용하는 최대 복제 지연)
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', str(DB_REPLICA_MAX_LAG)))
+
+
+class Replica:
+    """복제본 하나의 접속 정보, 풀, 상태"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.pool = None
+        self.healthy = True   # 첫 헬스체크 전에는 정상으로 간주
+        self.lag = None       # 마지막으로 확인한 복제 지연(초)
+        self.error = None
+        self.reads = 0
+        self.failures = 0
+
+    @property
+    def name(self):
+        return f"{self.host}:{self.port}"
+
+    async def get_pool(self):
+        if self.pool is None:
+            self.pool = await _create_async_pool(host=self.host, port=self.port)
+        return self.pool
+
+    def mark_down(self, error):
+        self.healthy = False
+        self.error = str(error)
+        self.failures += 1
+
+    def stats(self):
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "error": self.error,
+            "reads": self.reads,
+            "failures": self.failures,
+            "size": self.pool.size if self.pool is not None else 0,
+            "idle": self.pool.freesize if self.pool is not None else 0,
+        }
+
+
+def _parse_replicas(value):
+    replicas = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(":")
+        replicas.append(Replica(host, int(port or os.getenv('MYSQL_PORT', '3306'))))
+    return replicas
+
+
+_replicas = _parse_replicas(os.getenv('MYSQL_REPLICA_HOSTS', ''))
+_replica_turn = 0
+_replica_check_task = None
+
+
+def _next_replica():
+    """정상인 복제본을 라운드로빈으로 하나 고른다 (없으면 None)"""
+    global _replica_turn
+    healthy = [replica for replica in _replicas if replica.healthy]
+    if not healthy:
+        return None
+    _replica_turn = (_replica_turn + 1) % len(healthy)
+    return healthy[_replica_turn]
+
+
+async def _check_replica(replica):
+    try:
+        pool = await replica.get_pool()
+        conn = await asyncio.wait_for(pool.acquire(), timeout=DB_REPLICA_CHECK_INTERVAL)
+        try:
+            lag = await _replication_lag(conn)
+        finally:
+            pool.release(conn)
+    except Exception as e:
+        replica.mark_down(e)
+        return
+    replica.lag = lag
+    if lag is not None and lag > DB_REPLICA_MAX_LAG:
+        replica.healthy = False
+        replica.error = f"복제 지연 {lag}초 > {DB_REPLICA_MAX_LAG}초"
+    else:
+        replica.healthy = True
+        replica.error = None
+
+
+async def _replication_lag(conn):
+    """복제 지연(초). 복제가 멈췄으면 무한대, 복제 설정이 없는 서버(테스트용 독립 DB)는 0"""
+    async with conn.cursor() as cursor:
+        try:
+            await cursor.execute("SHOW REPLICA STATUS")  # MySQL 8.0.22+
+        except pymysql.err.MySQLError:
+            await cursor.execute("SHOW SLAVE STATUS")
+        row = await cursor.fetchone()
+    if not row:
+        return 0
+    lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+    return float('inf') if lag is None else float(lag)
+
+
+async def _replica_check_loop():
+    while True:
+        await asyncio.sleep(DB_REPLICA_CHECK_INTERVAL)
+        await asyncio.gather(*(_check_replica(replica) for replica in _replicas))
+
+
+def mark_write(session):
+    """
+    이 세션이 방금 데이터를 바꿨음을 기록 (DB_READ_YOUR_WRITES_SECONDS 동안 읽기를 원본에서)
+    로그인한 세션만 기록한다 (익명 요청마다 세션을 새로 만들지 않도록)
+    """
+    if _replicas and session.get("user_id"):
+        session["db_primary_until"] = time.time() + DB_READ_YOUR_WRITES_SECONDS
+
+
+def can_use_replica(session):
+    """이 세션의 읽기를 복제본에서 해도 되는지 (최근에 쓴 적이 없으면 True)"""
+    return session.get("db_primary_until", 0) <= time.time()
+
+
+async def _acquire(pool):
+    start = time.monotonic()
+    try:
+        conn = await asyncio.wait_for(
+            pool.acquire(),
+            timeout=float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10'))
+        )
+    except asyncio.TimeoutError:
+        _async_stats["timeouts_total"] += 1
+        raise PoolTimeout("DB 커넥션 풀 대기 시간 초과")
+    waited = time.monotonic() - start
+    metrics.record_pool_wait(waited)
+    _async_stats["acquired_total"] += 1
+    _async_stats["wait_seconds_total"] += waited
+    _async_stats["wait_seconds_max"] = max(_async_stats["wait_seconds_max"], waited)
+    return conn
+
+
+async def _acquire_readonly():
+    """복제본에서 커넥션을 빌린다. 정상인 복제본이 없거나 접속에 실패하면 (None, None)"""
+    replica = _next_replica()
+    if replica is None:
+        if _replicas:
+            _async_stats["primary_fallbacks"] += 1
+        return None, None
+    try:
+        pool = await replica.get_pool()
+        conn = await _acquire(pool)
+    except (OSError, pymysql.err.OperationalError) as e:
+        # 접속이 안 되는 복제본은 다음 헬스체크까지 제외하고 원본에서 읽음
+        replica.mark_down(e)
+        _async_stats["primary_fallbacks"] += 1
+        return None, None
+    replica.reads += 1
+    return pool, conn
+
+
+@asynccontextmanager
+async def get_async_connection(readonly=False):
+    """
+    비동기 풀에서 커넥션을 빌려오는 컨텍스트 매니저
+    사용 예)
+        async with get_async_connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(...)
+    블록을 벗어나면 열린 트랜잭션을 rollback하고 풀에 반납한다.
+    readonly=True 이면 복제본(MYSQL_REPLICA_HOSTS)에서 빌린다 (없거나 비정상이면 원본).
+    """
+    pool = conn = None
+    if readonly and _replicas:
+        pool, conn = await _acquire_readonly()
+    if conn is None:
+        pool = await get_async_pool()
+        conn = await _acquire(pool)
+    try:
+        yield conn
+    finally:
+        if not conn.closed and conn.get_transaction_status():
+            try:
+                await conn.rollback()
+            except Exception:
+                conn.close()
+        pool.release(conn)
+
+
+async def get_async_db():
+    """
+    FastAPI 의존성 함수 (async 버전)
+    사용 예) async def handler(conn = Depends(get_async_db)): ...
+    """
+    async with get_async_connection() as conn:
+        yield conn
+
+
+def async_pool_stats():
+    """비동기 풀 상태 조회"""
+    acquired = _async_stats["acquired_total"]
+    stats = {
+        "size": 0,
+        "in_use": 0,
+        "idle": 0,
+        "minsize": int(os.getenv('DB_POOL_MIN', '1')),
+        "maxsize": int(os.getenv('DB_POOL_MAX', '10')),
+        "acquired_total": acquired,
+        "timeouts_total": _async_stats["timeouts_total"],
+        "wait_seconds_total": round(_async_stats["wait_seconds_total"], 6),
+        "wait_seconds_avg": round(_async_stats["wait_seconds_total"] / acquired, 6) if acquired else 0.0,
+        "wait_seconds_max": round(_async_stats["wait_seconds_max"], 6),
+    }
+    if _async_pool is not None:
+        stats["size"] = _async_pool.size
+        stats["idle"] = _async_pool.freesize
+        stats["in_use"] = _async_pool.size - _async_pool.freesize
+    if _replicas:
+        stats["replica_primary_fallbacks"] = _async_stats["primary_fallbacks"]
+        stats["replicas"] = {replica.name: replica.stats() for replica in _replicas}
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# 서버 시작/종료: main.py 의 lifespan 에서 호출
+# 커넥션 풀은 두 개다.
+# - 비동기 풀(aiomysql, get_async_connection): 회원/게시글/로그인 등 async 라우터의 모든 쿼리
+# - 동기 풀(pymysql ConnectionPool, get_connection): 스키마 마이그레이션, SQLAlchemy 세션(app.deps.get_db), 스크립트
+# 첫 요청이 풀 생성/접속 비용을 떠안지 않도록 시작할 때 둘 다 미리 연결해 두고, 종료할 때 모두 닫는다.
+# (lifespan 없이 쓰는 스크립트에서는 예전처럼 처음 사용할 때 풀이 만들어진다)
+# ---------------------------------------------------------------------------
+
+_startup_stats = {"startup_seconds": None, "warmed_connections": 0, "warmed_sync_connections": 0,
+                  "error": None, "sync_error": None}
+
+
+async def startup():
+    """
+    비동기 풀 생성 + DB_POOL_WARMUP개(기본 DB_POOL_MIN) 커넥션 미리 연결,
+    동기 풀도 DB_SYNC_POOL_WARMUP개(기본 DB_POOL_MIN) 미리 연결, 복제본 헬스체크 시작
+    """
+    global _replica_check_task
+    start = time.perf_counter()
+    warmup = int(os.getenv('DB_POOL_WARMUP', os.getenv('DB_POOL_MIN', '1')))
+    try:
+        pool = await get_async_pool()
+        _startup_stats["warmed_connections"] = await _warm_up(pool, warmup)
+        _startup_stats["error"] = None
+    except Exception as e:
+        # DB가 아직 안 떠 있어도 서버는 시작 (첫 요청 때 다시 연결 시도)
+        logger.warning("DB 커넥션 풀 준비 실패 (첫 요청 때 다시 시도): %s", e)
+        _startup_stats["error"] = str(e)
+    try:
+        sync_warmup = int(os.getenv('DB_SYNC_POOL_WARMUP', os.getenv('DB_POOL_MIN', '1')))
+        _startup_stats["warmed_sync_connections"] = await asyncio.to_thread(_warm_up_sync, get_pool(), sync_warmup)
+        _startup_stats["sync_error"] = None
+    except Exception as e:
+        logger.warning("동기 DB 커넥션 풀 준비 실패 (처음 사용할 때 다시 시도): %s", e)
+        _startup_stats["sync_error"] = str(e)
+    if _replicas:
+        # 첫 헬스체크(복제본 풀 생성 포함)는 기다렸다가, 이후는 백그라운드에서 주기적으로
+        await asyncio.gather(*(_check_replica(replica) for replica in _replicas))
+        _replica_check_task = asyncio.create_task(_replica_check_loop())
+    _startup_stats["startup_seconds"] = round(time.perf_counter() - start, 6)
+
+
+async def _warm_up(pool, count):
+    # 동시에 count개를 빌렸다가 반납하면 풀 안에 열린 커넥션이 count개 남는다.
+    count = min(count, getattr(pool, "maxsize", 1))
+    if count <= 0:
+        return 0
+    results = await asyncio.gather(*(pool.acquire() for _ in range(count)), return_exceptions=True)
+    for conn in results:
+        if not isinstance(conn, BaseException):
+            pool.release(conn)
+    for error in results:
+        if isinstance(error, BaseException):
+            raise error
+    return count
+
+
+def _warm_up_sync(pool, count):
+    # 동기 풀: count개를 차례로 빌렸다가 한꺼번에 반납
+    count = min(count, pool.maxsize)
+    conns = []
+    try:
+        for _ in range(count):
+            conns.append(pool.acquire())
+    finally:
+        for conn in conns:
+            pool.release(conn)
+    return count
+
+
+async def shutdown():
+    """비동기 풀(원본, 복제본)과 동기 풀의 커넥션을 모두 닫는다"""
+    global _async_pool, _pool, _replica_check_task
+    if _replica_check_task is not None:
+        _replica_check_task.cancel()
+        _replica_check_task = None
+    for replica in _replicas:
+        if replica.pool is not None:
+            pool, replica.pool = replica.pool, None
+            pool.close()
+            await pool.wait_closed()
+    if _async_pool is not None:
+        pool, _async_pool = _async_pool, None
+        pool.close()
+        await pool.wait_closed()
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.close()
+
+
+def startup_stats():
+    return dict(_startup_stats)
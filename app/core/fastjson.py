@@ -0,0 +1,57 @@
+# DB에서 읽은(이미 검증된) 행을 빠르게 JSON으로 바꾸는 직렬화 경로
+# response_model=UserOut 으로 반환하면 FastAPI가 행마다 Pydantic 검증(EmailStr은 email-validator로 다시 검사)을 한 뒤 직렬화한다.
+# DB의 값은 저장할 때 이미 UserCreate/UserUpdate로 검증되었으므로, 읽기 API에서는 검증을 건너뛰고
+# 모델의 필드 순서대로 값만 뽑아서 orjson으로 바로 bytes를 만든다.
+# 결과는 기존 응답과 바이트 단위로 같아야 한다 (확인: python -m pytest -q tests/test_json_parity.py)
+#
+# FAST_JSON=0 이면 사용하지 않고 기존처럼 response_model 검증/직렬화 경로를 탄다.
+import os
+from operator import itemgetter
+
+from starlette.responses import Response
+
+try:
+    import orjson  # 선택 의존성 (없으면 Pydantic 직렬화기로 대체)
+except ImportError:
+    orjson = None
+
+FAST_JSON = os.getenv('FAST_JSON', '1') == '1'
+
+
+class RowSerializer:
+    """
+    Pydantic 모델 하나에 대해 미리 만들어 둔 직렬화기
+    사용 예)
+        user_json = RowSerializer(UserOut)
+        user_json.dumps(row)          # 행 하나 -> bytes
+        user_json.dumps_many(rows)    # 행 목록 -> JSON 배열 bytes
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = tuple(model.model_fields)
+        self._values = itemgetter(*self.fields)
+        self._serializer = model.__pydantic_serializer__
+
+    def to_dict(self, row):
+        # 모델 필드 순서대로 (FastAPI 응답과 같은 키 순서), 모델에 없는 컬럼(password 등)은 빠짐
+        values = self._values(row)
+        if len(self.fields) == 1:
+            values = (values,)
+        return dict(zip(self.fields, values))
+
+    def dumps(self, row):
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(row))
+        # orjson이 없으면 검증 없이 모델 객체만 만들어서 Pydantic의 (Rust) 직렬화기로 출력
+        return self._serializer.to_json(self.model.model_construct(**self.to_dict(row)), warnings=False)
+
+    def dumps_many(self, rows):
+        if orjson is not None:
+            return orjson.dumps([self.to_dict(row) for row in rows])
+        return b"[" + b",".join(self.dumps(row) for row in rows) + b"]"
+
+
+class FastJSONResponse(Response):
+    """이미 만들어진 JSON bytes를 그대로 보내는 응답"""
+    media_type = "application/json"
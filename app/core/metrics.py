@@ -0,0 +1,224 @@
+# 요청 지연시간 / DB 쿼리 / 커넥션 풀 대기 / bcrypt 시간 / 응답 압축 계측
+# - MetricsMiddleware: 라우트별 응답시간 히스토그램 기록 + Server-Timing 응답 헤더
+# - record_*(): DB 커서, 커넥션 풀, 비밀번호 서비스, 압축 미들웨어에서 호출
+# - render_prometheus(): /metrics 에서 Prometheus 텍스트 형식으로 출력
+# METRICS_ENABLED=0 이면 미들웨어를 붙이지 않고 record_*()는 바로 반환한다.
+import contextvars
+import os
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+
+ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+SERVER_TIMING = os.getenv('SERVER_TIMING', '1') == '1'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+class Histogram:
+    """Prometheus 형식 히스토그램 (라벨별 누적 버킷, 합계, 개수)"""
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, labelnames=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._series = {}  # 라벨 값 튜플 -> [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+            items = [(labels, list(series)) for labels, series in items]
+        for labels, series in items:
+            base = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+            bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+            counts = series[:len(self.buckets)] + [series[-1]]
+            for bound, count in zip(bounds, counts):
+                bucket_labels = ",".join(base + [f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {count}")
+            suffix = "{" + ",".join(base) + "}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-2]}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간(초)",
+    labelnames=("method", "route", "status"))
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "요청 하나에서 실행한 DB 쿼리 수",
+    buckets=QUERY_COUNT_BUCKETS, labelnames=("route",))
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "요청 하나에서 DB 쿼리에 쓴 시간(초)", labelnames=("route",))
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "DB 쿼리 실행 시간(초)")
+POOL_WAIT = Histogram("db_pool_wait_seconds", "DB 커넥션 풀에서 커넥션을 얻기까지 기다린 시간(초)")
+PASSWORD_HASH_TIME = Histogram(
+    "password_hash_duration_seconds", "bcrypt 해싱/검증 시간(초)", buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+COMPRESSION_RATIO = Histogram(
+    "http_response_compression_ratio", "압축 후 크기 / 원래 크기",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9, 1), labelnames=("encoding",))
+COMPRESSION_TIME = Histogram(
+    "http_response_compression_seconds", "응답 하나를 압축하는 데 쓴 시간(초)",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1), labelnames=("encoding",))
+
+ACTIVITY_BATCH_SIZE = Histogram(
+    "activity_flush_batch_rows", "로그인 기록 upsert 한 번에 쓴 회원 수",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 5000))
+ACTIVITY_FLUSH_LAG = Histogram(
+    "activity_flush_lag_seconds", "로그인 기록이 버퍼에 들어와서 DB에 쓰이기까지 걸린 시간(초, flush마다 가장 오래된 기록 기준)",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300))
+
+HISTOGRAMS = [REQUEST_LATENCY, REQUEST_DB_QUERIES, REQUEST_DB_TIME, DB_QUERY_LATENCY, POOL_WAIT, PASSWORD_HASH_TIME,
+              COMPRESSION_RATIO, COMPRESSION_TIME, ACTIVITY_BATCH_SIZE, ACTIVITY_FLUSH_LAG]
+
+
+class RequestTimings:
+    """요청 하나 동안 누적되는 시간들 (Server-Timing 헤더용)"""
+    __slots__ = ("db_count", "db_time", "pool_wait", "bcrypt_time")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.bcrypt_time = 0.0
+
+
+# 스레드풀/태스크로 넘어가도 같은 객체를 가리키도록 contextvar에는 가변 객체를 넣는다.
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+def record_db_query(seconds):
+    if not ENABLED:
+        return
+    DB_QUERY_LATENCY.observe(seconds)
+    timings = _current.get()
+    if timings is not None:
+        timings.db_count += 1
+        timings.db_time += seconds
+
+
+def record_pool_wait(seconds):
+    if not ENABLED:
+        return
+    POOL_WAIT.observe(seconds)
+    timings = _current.get()
+    if timings is not None:
+        timings.pool_wait += seconds
+
+
+def record_password_hash(seconds):
+    if not ENABLED:
+        return
+    PASSWORD_HASH_TIME.observe(seconds)
+    timings = _current.get()
+    if timings is not None:
+        timings.bcrypt_time += seconds
+
+
+def record_compression(encoding, bytes_in, bytes_out, seconds):
+    if not ENABLED or not bytes_in:
+        return
+    COMPRESSION_RATIO.observe(bytes_out / bytes_in, encoding)
+    COMPRESSION_TIME.observe(seconds, encoding)
+
+
+def record_activity_batch(rows):
+    if ENABLED:
+        ACTIVITY_BATCH_SIZE.observe(rows)
+
+
+def record_activity_flush(lag):
+    if ENABLED:
+        ACTIVITY_FLUSH_LAG.observe(lag)
+
+
+class MetricsMiddleware:
+    """라우트별 응답시간/DB 사용량 기록, Server-Timing 헤더 추가 (순수 ASGI 미들웨어)"""
+
+    def __init__(self, app, server_timing=SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    elapsed = time.perf_counter() - start
+                    MutableHeaders(scope=message).append("Server-Timing", _server_timing(timings, elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - start
+            route = _route_label(scope)
+            REQUEST_LATENCY.observe(elapsed, scope["method"], route, str(status))
+            REQUEST_DB_QUERIES.observe(timings.db_count, route)
+            REQUEST_DB_TIME.observe(timings.db_time, route)
+
+
+def _route_label(scope):
+    # 라우팅 후 scope["route"]에 매칭된 라우트가 들어있다. 경로 대신 템플릿(/users/{user_id})으로 묶는다.
+    path = getattr(scope.get("route"), "path", None)
+    return path if path is not None else "unmatched"
+
+
+def _server_timing(timings, elapsed):
+    parts = [f"app;dur={elapsed * 1000:.1f}",
+             f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_count} queries"']
+    if timings.pool_wait:
+        parts.append(f"pool;dur={timings.pool_wait * 1000:.1f}")
+    if timings.bcrypt_time:
+        parts.append(f"bcrypt;dur={timings.bcrypt_time * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def render_prometheus(gauges=None):
+    """
+    모든 히스토그램 + 전달받은 게이지 값을 Prometheus 텍스트 형식으로 반환
+    gauges: {"db_pool": {"in_use": 3, ...}, ...} -> eduapp_db_pool_in_use 3
+    """
+    blocks = [histogram.render() for histogram in HISTOGRAMS]
+    for name, value in _flatten("eduapp", gauges or {}):
+        blocks.append(f"# TYPE {name} gauge\n{name} {value}")
+    return "\n".join(blocks) + "\n"
+
+
+def _flatten(prefix, values):
+    for key, value in values.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
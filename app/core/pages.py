@@ -0,0 +1,121 @@
+# HTML 페이지 렌더링 캐시
+# 페이지(index, signup, users, mypage)의 HTML은 요청마다 달라지지 않고
+# "로그인 여부/로그인한 사용자 이름/안내 메시지"에 따라서만 달라진다.
+# 그래서 (템플릿, 안내 메시지, 사용자 이름) 조합별로 한 번만 렌더링해서 bytes로 보관하고 재사용한다.
+# - ETag: 렌더링 결과의 해시. 브라우저가 If-None-Match로 같은 값을 보내면 본문 없이 304 응답
+# - Jinja2 바이트코드 캐시: 템플릿을 파이썬 코드로 컴파일한 결과를 파일로 저장해서 서버 재시작 때 재사용
+# - prerender(): 서버 시작 시 로그인 안 한 상태의 페이지를 미리 렌더링
+# - stream_page(): 캐시된 페이지 앞부분을 먼저 보내고, DB 데이터로 그린 부분은 이어서 보내는 스트리밍 응답
+import hashlib
+import os
+
+import jinja2
+from starlette.responses import Response, StreamingResponse
+
+from app.core.assets import asset_url
+from app.core.cache import TTLCache
+from app.core.conditional import etag_matches, not_modified
+
+TEMPLATE_DIR = "app/templates"
+PAGE_CACHE_SIZE = int(os.getenv('PAGE_CACHE_SIZE', '1000'))
+# 템플릿 파일을 고치면 바로 반영할지 여부 (개발용. 1이면 페이지 캐시도 쓰지 않음)
+TEMPLATE_AUTO_RELOAD = os.getenv('TEMPLATE_AUTO_RELOAD', '0') == '1'
+
+# 바이트코드 캐시 위치 (JINJA_CACHE_DIR 없으면 OS 임시 디렉터리)
+_bytecode_dir = os.getenv('JINJA_CACHE_DIR')
+if _bytecode_dir:
+    os.makedirs(_bytecode_dir, exist_ok=True)
+
+env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+    autoescape=jinja2.select_autoescape(),
+    bytecode_cache=jinja2.FileSystemBytecodeCache(_bytecode_dir),
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+)
+# {{ asset_url('style.css') }} -> /static/style.<해시>.css (app/core/assets.py)
+env.globals["asset_url"] = asset_url
+
+# (템플릿 이름, 안내 메시지, 사용자 이름) -> (HTML bytes, ETag)
+# 사용자 이름별 변형은 로그인한 사용자 수만큼 생기므로 LRU로 개수를 제한한다.
+_pages = TTLCache(maxsize=PAGE_CACHE_SIZE, ttl=365 * 24 * 3600)
+_stats = {"renders": 0, "not_modified": 0}
+
+# 서버 시작 시 미리 렌더링할 (템플릿, 안내 메시지) 목록 (로그인 안 한 상태)
+LOGIN_REQUIRED = "로그인 해야 이용 가능합니다."
+PRERENDER_PAGES = [
+    ("index.html", None),
+    ("signup.html", None),
+    ("users.html", LOGIN_REQUIRED),
+    ("mypage.html", LOGIN_REQUIRED),
+]
+
+
+def _render(name, auth_message, user_name):
+    key = (name, auth_message, user_name)
+    page = None if TEMPLATE_AUTO_RELOAD else _pages.get(key)
+    if page is None:
+        html = env.get_template(name).render(auth_message=auth_message, user_name=user_name)
+        body = html.encode('utf-8')
+        page = (body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+        _pages.set(key, page)
+        _stats["renders"] += 1
+    return page
+
+
+# 템플릿 안에서 데이터 조각이 들어갈 자리 표시
+STREAM_MARKER = b"<!--stream:rows-->"
+
+
+def _login_user_name(request):
+    return request.session.get('user_name') if request.session.get('user_id') else None
+
+
+def render_page(request, name, auth_message=None):
+    """
+    캐시된 페이지로 응답. 로그인 상태는 세션에서 읽는다.
+    사용 예) return render_page(request, "index.html")
+    """
+    body, etag = _render(name, auth_message, _login_user_name(request))
+    headers = {
+        "ETag": etag,
+        # 로그인 상태(쿠키)마다 내용이 다르므로 공유 캐시(프록시)에는 저장하지 않고, 브라우저는 매번 ETag로 재검증
+        "Cache-Control": "private, no-cache",
+        "Vary": "Cookie",
+    }
+    if etag_matches(request, etag):
+        _stats["not_modified"] += 1
+        return not_modified(headers)
+    return Response(body, media_type="text/html", headers=headers)
+
+
+def render_fragment(name, **context):
+    """데이터가 들어가는 HTML 조각 렌더링 (캐시하지 않음)"""
+    return env.get_template(name).render(**context)
+
+
+def stream_page(request, name, fill):
+    """
+    페이지를 STREAM_MARKER 앞/뒤로 나눠서 chunked로 응답
+    앞부분(head, 네비게이션 등)은 캐시된 HTML을 바로 보내서 브라우저가 CSS를 먼저 받아 그리기 시작하게 하고,
+    fill()(async, HTML 문자열 반환)로 DB를 조회해서 그린 조각과 뒷부분을 이어서 보낸다.
+    """
+    body, _ = _render(name, None, _login_user_name(request))
+    head, _, tail = body.partition(STREAM_MARKER)
+
+    async def chunks():
+        yield head
+        yield (await fill()).encode('utf-8')
+        yield tail
+
+    return StreamingResponse(chunks(), media_type="text/html",
+                             headers={"Cache-Control": "private, no-cache"})
+
+
+def prerender():
+    """로그인 안 한 상태의 페이지들을 미리 렌더링 (바이트코드 캐시에도 저장됨)"""
+    for name, auth_message in PRERENDER_PAGES:
+        _render(name, auth_message, None)
+
+
+def page_cache_stats():
+    return {**_pages.stats(), **_stats}
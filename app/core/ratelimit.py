@@ -0,0 +1,166 @@
+# 요청 횟수 제한(rate limit)
+# - TokenBucketLimiter: 버킷에 capacity개까지 토큰이 차고 1분에 per_minute개씩 다시 채워진다. 요청마다 토큰 1개 사용
+#   (짧은 순간의 몰림은 capacity까지 허용하고, 길게 보면 per_minute 속도로 제한)
+# - SlidingWindowCounter: 최근 window초 동안의 횟수 (직전 구간 값을 경과 비율만큼 섞어서 계산하는 근사 방식)
+# 저장소(backend)는 RATE_LIMIT_BACKEND 환경변수로 선택
+#   - memory (기본): 프로세스 메모리. 워커 1개일 때
+#   - redis: 워커/서버 여러 대가 같은 카운터를 보도록 할 때 (redis 패키지 필요, REDIS_URL)
+import math
+import os
+import threading
+import time
+
+from app.core.cache import TTLCache
+
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+
+
+class MemoryRateLimitBackend:
+    def __init__(self, maxsize=100000):
+        self._buckets = TTLCache(maxsize=maxsize)  # key -> (남은 토큰, 마지막 갱신 시각)
+        self._counters = TTLCache(maxsize=maxsize)  # "key:구간번호" -> 횟수
+        self._lock = threading.Lock()
+
+    async def take(self, key, capacity, per_second, cost=1):
+        """토큰 cost개 사용. (허용 여부, 다시 시도까지 기다릴 초) 반환"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key) or (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # 가득 찰 때까지 걸리는 시간이 지나면 버킷이 없는 것과 같으므로 그때 만료
+            self._buckets.set(key, (tokens, now), ttl=capacity / per_second + 1)
+        return allowed, 0.0 if allowed else (cost - tokens) / per_second
+
+    async def hit(self, key, window):
+        """현재 구간 횟수 +1 후 최근 window초 동안의 횟수 반환"""
+        slot = int(time.time() // window)
+        with self._lock:
+            count = self._counters.get(f"{key}:{slot}", 0) + 1
+            self._counters.set(f"{key}:{slot}", count, ttl=window * 2)
+        return await self.count(key, window)
+
+    async def count(self, key, window):
+        now = time.time()
+        slot = int(now // window)
+        current = self._counters.get(f"{key}:{slot}", 0)
+        previous = self._counters.get(f"{key}:{slot - 1}", 0)
+        return previous * (1 - (now % window) / window) + current
+
+    async def reset(self, key, window):
+        slot = int(time.time() // window)
+        self._counters.delete(f"{key}:{slot}")
+        self._counters.delete(f"{key}:{slot - 1}")
+
+
+# 토큰 계산과 저장을 redis 안에서 한 번에 처리 (여러 워커가 동시에 같은 키를 써도 안전)
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """redis 저장소 (pip install redis 필요)"""
+
+    def __init__(self, url, prefix="eduapp:rl:"):
+        import redis.asyncio as redis  # 선택 의존성
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key, capacity, per_second, cost=1):
+        allowed, tokens = await self._take(keys=[self._prefix + key],
+                                           args=[capacity, per_second, time.time(), cost])
+        if allowed:
+            return True, 0.0
+        return False, (cost - float(tokens)) / per_second
+
+    async def hit(self, key, window):
+        slot = int(time.time() // window)
+        name = f"{self._prefix}{key}:{slot}"
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.incr(name)
+            pipe.expire(name, int(window * 2))
+            await pipe.execute()
+        return await self.count(key, window)
+
+    async def count(self, key, window):
+        now = time.time()
+        slot = int(now // window)
+        current, previous = await self._redis.mget(f"{self._prefix}{key}:{slot}",
+                                                   f"{self._prefix}{key}:{slot - 1}")
+        return int(previous or 0) * (1 - (now % window) / window) + int(current or 0)
+
+    async def reset(self, key, window):
+        slot = int(time.time() // window)
+        await self._redis.delete(f"{self._prefix}{key}:{slot}", f"{self._prefix}{key}:{slot - 1}")
+
+
+class TokenBucketLimiter:
+    """키(IP, 이메일 등)마다 토큰 버킷 하나"""
+
+    def __init__(self, name, capacity, per_minute, backend):
+        self.name = name
+        self.capacity = capacity
+        self.per_second = per_minute / 60
+        self.backend = backend
+        self.rejected = 0
+
+    async def take(self, key):
+        """허용이면 0.0, 거부면 다시 시도까지 기다릴 초(올림) 반환"""
+        allowed, retry_after = await self.backend.take(f"{self.name}:{key}", self.capacity, self.per_second)
+        if allowed:
+            return 0.0
+        self.rejected += 1
+        return float(math.ceil(retry_after))
+
+
+class SlidingWindowCounter:
+    """키마다 최근 window초 동안의 횟수. limit 이상이면 exceeded"""
+
+    def __init__(self, name, limit, window, backend):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.backend = backend
+
+    async def hit(self, key):
+        return await self.backend.hit(f"{self.name}:{key}", self.window)
+
+    async def exceeded(self, key):
+        return await self.backend.count(f"{self.name}:{key}", self.window) >= self.limit
+
+    async def reset(self, key):
+        await self.backend.reset(f"{self.name}:{key}", self.window)
+
+
+_backend = None
+
+
+def get_rate_limit_backend():
+    """RATE_LIMIT_BACKEND 환경변수에 따라 저장소 반환"""
+    global _backend
+    if _backend is None:
+        if os.getenv('RATE_LIMIT_BACKEND', 'memory').lower() == 'redis':
+            _backend = RedisRateLimitBackend(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+        else:
+            _backend = MemoryRateLimitBackend()
+    return _backend
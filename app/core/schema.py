@@ -0,0 +1,205 @@
+# DB 스키마/인덱스 마이그레이션
+# 회원 API는 "먼저 SELECT로 확인 후 쓰기" 대신 users.email UNIQUE 인덱스에 기대어 한 번에 INSERT/UPDATE 한다.
+# 이 모듈은 필요한 테이블과 인덱스가 있는지 확인하고 없으면 만든다. 여러 번 실행해도 안전하다.
+#
+# 실행 방법)
+#   python -m app.core.schema
+# 서버도 시작할 때 자동 실행한다 (DB_AUTO_MIGRATE=1, 기본값).
+# DB_AUTO_MIGRATE=0 이면 만들지 않고 확인만 해서, 필요한 테이블/컬럼이 없으면 서버를 띄우지 않는다.
+# (회원 조회 SQL이 version, post_count 컬럼을 읽으므로 마이그레이션 없이 띄우면 모든 회원 API가 500)
+import logging
+
+import pymysql
+
+from app.core.db import get_connection
+
+logger = logging.getLogger(__name__)
+
+# 워커 여러 개가 동시에 마이그레이션할 때, 다른 워커가 먼저 만든 컬럼/인덱스 (이미 있음)
+ER_DUP_FIELDNAME = 1060
+ER_DUP_KEYNAME = 1061
+
+CREATE_USERS_TABLE = """
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME DEFAULT NULL,
+    version INT NOT NULL DEFAULT 1,
+    post_count INT NOT NULL DEFAULT 0,
+    UNIQUE KEY uq_users_email (email)
+) DEFAULT CHARSET=utf8mb4
+"""
+
+CREATE_POSTS_TABLE = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    author_id INT NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME DEFAULT NULL,
+    KEY idx_posts_author_created (author_id, created_at),
+    KEY idx_posts_created (created_at)
+) DEFAULT CHARSET=utf8mb4
+"""
+
+# 로그인/접속 기록 (app/services/activity.py 가 모아서 upsert)
+# 회원마다 한 행, PK(user_id) 충돌로 INSERT ... ON DUPLICATE KEY UPDATE
+CREATE_USER_ACTIVITY_TABLE = """
+CREATE TABLE IF NOT EXISTS user_activity (
+    user_id INT PRIMARY KEY,
+    login_count INT NOT NULL DEFAULT 0,
+    last_login_at DATETIME DEFAULT NULL,
+    last_seen_at DATETIME DEFAULT NULL
+) DEFAULT CHARSET=utf8mb4
+"""
+
+# 테이블 이름 -> CREATE TABLE 문
+TABLES = [
+    ("users", CREATE_USERS_TABLE),
+    ("posts", CREATE_POSTS_TABLE),
+    ("user_activity", CREATE_USER_ACTIVITY_TABLE),
+]
+
+# 예전에 만든 테이블에 없으면 ALTER TABLE로 추가할 컬럼 (테이블, 컬럼 이름, 컬럼 정의)
+COLUMNS = [
+    ("users", "version", "INT NOT NULL DEFAULT 1"),  # 회원 정보 버전 (ETag용)
+    ("users", "post_count", "INT NOT NULL DEFAULT 0"),  # 작성한 게시글 수 (COUNT(*) 없이 바로 보여주기 위한 중복 저장)
+]
+
+# (테이블, 인덱스 이름, 컬럼 목록, UNIQUE 여부)
+INDEXES = [
+    ("users", "uq_users_email", ("email",), True),
+    # 작성자별 게시글 목록: WHERE author_id=? ORDER BY created_at DESC, id DESC
+    # (InnoDB 보조 인덱스에는 PK(id)가 붙어 있으므로 (author_id, created_at, id) 순서로 정렬된 채 읽힌다)
+    ("posts", "idx_posts_author_created", ("author_id", "created_at"), False),
+    # 전체 피드: ORDER BY created_at DESC, id DESC
+    ("posts", "idx_posts_created", ("created_at",), False),
+]
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS cnt FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """,
+        (table, column)
+    )
+    return cursor.fetchone()['cnt'] > 0
+
+
+def _index_exists(cursor, table, columns, unique):
+    """같은 컬럼 구성의 인덱스가 이미 있는지 확인 (이름은 달라도 됨. 예: email UNIQUE로 만든 'email' 인덱스)"""
+    cursor.execute(
+        """
+        SELECT index_name AS index_name, non_unique AS non_unique,
+               GROUP_CONCAT(column_name ORDER BY seq_in_index) AS cols
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s
+        GROUP BY index_name, non_unique
+        """,
+        (table,)
+    )
+    wanted = ",".join(columns)
+    for row in cursor.fetchall():
+        if row['cols'] == wanted and (not unique or row['non_unique'] == 0):
+            return True
+    return False
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS cnt FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+        """,
+        (table,)
+    )
+    return cursor.fetchone()['cnt'] > 0
+
+
+def _execute_ignoring(cursor, sql, *codes):
+    """다른 프로세스가 먼저 만들어서 생기는 에러(codes)는 무시. 실제로 만들었으면 True"""
+    try:
+        cursor.execute(sql)
+        return True
+    except pymysql.err.MySQLError as e:
+        if e.args and e.args[0] in codes:
+            return False
+        raise
+
+
+def _ensure(cursor):
+    created = []
+    for table, create_sql in TABLES:
+        cursor.execute(create_sql)
+    for table, column, definition in COLUMNS:
+        if _column_exists(cursor, table, column):
+            continue
+        if _execute_ignoring(cursor, f"ALTER TABLE {table} ADD COLUMN {column} {definition}", ER_DUP_FIELDNAME):
+            created.append(f"{table}.{column}")
+    for table, name, columns, unique in INDEXES:
+        if _index_exists(cursor, table, columns, unique):
+            continue
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        if _execute_ignoring(cursor, f"CREATE {kind} {name} ON {table} ({', '.join(columns)})", ER_DUP_KEYNAME):
+            created.append(name)
+    return created
+
+
+def _missing(cursor):
+    """없는 테이블/컬럼 이름 목록"""
+    missing = [table for table, _ in TABLES if not _table_exists(cursor, table)]
+    missing += [f"{table}.{column}" for table, column, _ in COLUMNS
+                if table not in missing and not _column_exists(cursor, table, column)]
+    return missing
+
+
+def ensure_schema():
+    """필요한 테이블/컬럼/인덱스를 만들고, 새로 만든 컬럼/인덱스 이름 목록을 반환"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            created = _ensure(cursor)
+        conn.commit()
+        return created
+    finally:
+        conn.close()
+
+
+def prepare_schema(auto_migrate=True):
+    """
+    서버 시작 시 호출 (main.py lifespan)
+    auto_migrate=True면 ensure_schema(), False면 확인만 하고 없는 테이블/컬럼이 있으면 RuntimeError (서버 시작 중단)
+    DB에 접속할 수 없으면 경고만 남긴다 (db.startup()과 같이, DB가 뜨면 첫 요청부터 동작)
+    """
+    try:
+        conn = get_connection()
+    except pymysql.err.OperationalError as e:
+        logger.warning("DB에 접속할 수 없어 스키마 확인을 건너뜀: %s", e)
+        return
+    try:
+        with conn.cursor() as cursor:
+            if auto_migrate:
+                created = _ensure(cursor)
+                conn.commit()
+                if created:
+                    logger.info("DB 스키마 마이그레이션: %s 추가", ", ".join(created))
+                return
+            missing = _missing(cursor)
+    finally:
+        conn.close()
+    if missing:
+        raise RuntimeError(
+            f"DB 스키마가 최신이 아닙니다 (없음: {', '.join(missing)}). "
+            "python -m app.core.schema 를 실행하거나 DB_AUTO_MIGRATE=1 로 서버를 시작하세요."
+        )
+
+
+if __name__ == "__main__":
+    created = ensure_schema()
+    print("추가한 컬럼/인덱스:", created or "없음 (이미 최신)")
@@ -0,0 +1,258 @@
+# 서버 사이드 세션
+# Starlette SessionMiddleware는 세션 내용 전체를 JSON -> base64 -> 서명해서 쿠키에 담고,
+# 매 요청마다(정적 파일 요청까지) 서명을 검증하고 다시 만든다.
+# 여기서는 쿠키에는 추측 불가능한 세션 id만 넣고, 내용은 서버 저장소(backend)에 둔다.
+# - 지연 로딩: request.session에 실제로 접근하는 요청만 저장소에서 읽는다.
+# - 변경된 경우에만 저장: 세션 값을 바꾸지 않은 요청은 저장소 쓰기와 Set-Cookie가 없다.
+# - file 저장소: 저장/삭제는 스레드풀에서 하고, 만료된 파일은 lifespan의 start_sweeper()가 주기적으로 지운다.
+#   읽기(지연 로딩)는 이벤트 루프에서 파일을 바로 연다. 같은 서버의 워커 몇 개가 나눠 쓰는 용도이고,
+#   트래픽이 많은 운영 환경이나 서버가 여러 대면 공유 저장소(DB, redis 등)를 쓸 것.
+import asyncio
+import json
+import logging
+import os
+import re
+import secrets
+import time
+from collections.abc import MutableMapping
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_SESSION_ID_RE = re.compile(r'^[A-Za-z0-9_-]{20,100}$')
+# 만료된 세션 파일을 지우는 주기(초)
+SESSION_SWEEP_INTERVAL = float(os.getenv('SESSION_SWEEP_INTERVAL', '600'))
+
+
+class MemorySessionBackend:
+    """프로세스 메모리 저장소 (LRU + TTL). 워커가 하나일 때 사용"""
+
+    blocking = False   # 저장/삭제가 파일/네트워크 IO를 하는지 (True면 스레드풀에서 실행)
+
+    def __init__(self, maxsize=100000, ttl=14 * 24 * 3600):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def load(self, session_id):
+        data = self._cache.get(session_id)
+        return dict(data) if data is not None else None
+
+    def save(self, session_id, data, ttl):
+        self._cache.set(session_id, dict(data), ttl)
+
+    def delete(self, session_id):
+        self._cache.delete(session_id)
+
+
+class FileSessionBackend:
+    """
+    파일 저장소 (세션 하나당 JSON 파일 하나). 같은 서버의 워커 여러 개가 세션을 공유할 때 사용
+    파일 수정 시각(mtime)을 만료 시각으로 맞춰 두어서 sweep()이 파일을 열지 않고 만료 여부를 판단한다.
+    """
+
+    blocking = True
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def load(self, session_id):
+        try:
+            with open(self._path(session_id), encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get("expires_at", 0) < time.time():
+            self.delete(session_id)
+            return None
+        return stored.get("data") or {}
+
+    def save(self, session_id, data, ttl):
+        path = self._path(session_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        expires_at = time.time() + ttl
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"expires_at": expires_at, "data": data}, f, ensure_ascii=False)
+        os.utime(tmp_path, (expires_at, expires_at))
+        os.replace(tmp_path, path)  # 다른 워커가 반쯤 쓴 파일을 읽지 않도록 원자적으로 교체
+
+    def delete(self, session_id):
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self):
+        """만료된 세션 파일 삭제 (다시 읽히지 않는 세션 파일이 쌓이지 않도록). 지운 파일 수 반환"""
+        now = time.time()
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < now:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass   # 다른 워커가 먼저 지움
+        return removed
+
+
+class ServerSession(MutableMapping):
+    """
+    request.session 으로 보이는 세션 객체 (dict처럼 사용)
+    처음 접근할 때 저장소에서 읽고(load), 값을 바꾸면 dirty로 표시한다.
+    """
+
+    def __init__(self, backend, session_id):
+        self._backend = backend
+        self.session_id = session_id
+        self._data = None
+        self.dirty = False
+
+    @property
+    def data(self):
+        if self._data is None:
+            loaded = self._backend.load(self.session_id) if self.session_id else None
+            if loaded is None:
+                self.session_id = None  # 만료되었거나 없는 세션 id는 버림
+            self._data = loaded or {}
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.dirty = True
+
+    def __delitem__(self, key):
+        del self.data[key]
+        self.dirty = True
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        self._data = {}
+        self.dirty = True
+
+    def regenerate(self):
+        """
+        로그인처럼 권한이 바뀔 때 호출: 기존 세션 id를 저장소에서 지우고, 응답할 때 새 id를 발급한다.
+        남이 심어 둔 세션 id로 로그인해도 그 id에는 로그인 정보가 남지 않는다 (세션 고정 공격 방지)
+        """
+        data = self.data
+        if self.session_id:
+            self._backend.delete(self.session_id)
+        self.session_id = None
+        self._data = data
+        self.dirty = True
+
+
+class ServerSessionMiddleware:
+    """SessionMiddleware 대신 사용하는 서버 사이드 세션 미들웨어 (순수 ASGI)"""
+
+    def __init__(self, app, backend, cookie_name="session_id", max_age=14 * 24 * 3600,
+                 path="/", same_site="lax", https_only=False):
+        self.app = app
+        self.backend = backend
+        self.cookie_name = cookie_name
+        self.max_age = max_age
+        self.path = path
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:
+            self.security_flags += "; secure"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        session_id = HTTPConnection(scope).cookies.get(self.cookie_name)
+        if session_id and not _SESSION_ID_RE.match(session_id):
+            session_id = None
+        session = ServerSession(self.backend, session_id)
+        scope["session"] = session
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and session.dirty:
+                if self.backend.blocking:
+                    await run_in_threadpool(self._commit, session, session_id, MutableHeaders(scope=message))
+                else:
+                    self._commit(session, session_id, MutableHeaders(scope=message))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _commit(self, session, original_id, headers):
+        if session.data:
+            if not session.session_id:
+                # 저장된 세션이 없었거나 regenerate()로 버린 경우 새 id 발급
+                session.session_id = secrets.token_urlsafe(32)
+            self.backend.save(session.session_id, session.data, self.max_age)
+            headers.append("Set-Cookie", self._cookie(session.session_id, self.max_age))
+        elif original_id:
+            # 로그아웃 등으로 세션이 비었으면 저장소에서 지우고 쿠키도 만료
+            self.backend.delete(original_id)
+            headers.append("Set-Cookie", self._cookie("null", 0))
+
+    def _cookie(self, value, max_age):
+        expires = "expires=Thu, 01 Jan 1970 00:00:00 GMT; " if max_age == 0 else ""
+        return (f"{self.cookie_name}={value}; path={self.path}; {expires}"
+                f"Max-Age={max_age}; {self.security_flags}")
+
+
+_sweeper = None
+
+
+async def _sweep_loop(backend):
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        try:
+            removed = await run_in_threadpool(backend.sweep)
+            if removed:
+                logger.info("만료된 세션 %d개 삭제", removed)
+        except Exception:
+            logger.exception("만료된 세션 삭제 중 오류")
+
+
+def start_sweeper(backend):
+    """lifespan 시작 시 호출: 만료된 세션을 주기적으로 지우는 백그라운드 태스크 시작 (sweep이 있는 저장소만)"""
+    global _sweeper
+    if _sweeper is None and hasattr(backend, "sweep"):
+        _sweeper = asyncio.create_task(_sweep_loop(backend))
+
+
+async def stop_sweeper():
+    global _sweeper
+    if _sweeper is not None:
+        task, _sweeper = _sweeper, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def create_session_backend():
+    """
+    SESSION_BACKEND 환경변수에 따라 세션 저장소 생성
+    - memory (기본): 프로세스 메모리. 워커 1개일 때
+    - file: SESSION_DIR 디렉터리에 파일로 저장. 같은 서버의 여러 워커가 공유
+    """
+    kind = os.getenv('SESSION_BACKEND', 'memory').lower()
+    if kind == 'file':
+        return FileSessionBackend(os.getenv('SESSION_DIR', '.sessions'))
+    return MemorySessionBackend(maxsize=int(os.getenv('SESSION_MAX_ENTRIES', '100000')))
@@ -0,0 +1,58 @@
+# single-flight: 같은 키로 동시에 들어온 조회를 한 번만 실행하고 결과를 나눠 준다
+# 인기 회원 프로필(/users/{user_id})이나 로그인 직후 몰리는 /users/me 요청이 캐시가 비어 있는 순간
+# 똑같은 SELECT를 동시에 수십 번 보내지 않도록, 먼저 온 요청의 쿼리를 나머지가 기다렸다가 같이 쓴다.
+# - 예외도 기다리던 요청 모두에게 그대로 전달된다.
+# - timeout: 기다리는 쪽이 포기할 시간(초). 포기해도 실행 중인 조회는 다른 요청을 위해 계속 진행된다.
+# - 먼저 온 요청이 끊겨도(취소) 조회는 별도 태스크에서 계속되므로 기다리던 요청은 영향이 없다.
+#
+# 사용 예)
+#   _loads = SingleFlight("user")
+#   user = await _loads.do(user_id, lambda: load_user(user_id))
+import asyncio
+import os
+
+SINGLEFLIGHT_TIMEOUT = float(os.getenv('SINGLEFLIGHT_TIMEOUT', '10'))
+
+
+class SingleFlight:
+    def __init__(self, name, timeout=SINGLEFLIGHT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._tasks = {}       # 키 -> asyncio.Task
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0, "timeouts": 0}
+
+    async def do(self, key, fn, timeout=None):
+        """fn()(코루틴 함수)을 키별로 한 번만 실행. 같은 키로 실행 중이면 그 결과를 기다린다."""
+        self._stats["calls"] += 1
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["executions"] += 1
+            task = loop.create_task(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        try:
+            # shield: 기다리던 요청이 취소/타임아웃되어도 조회 자체는 취소하지 않음
+            return await asyncio.wait_for(asyncio.shield(task), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise
+
+    def _finished(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 아무도 기다리지 않게 된 태스크의 예외도 꺼내 둔다 ("never retrieved" 경고 방지)
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["errors"] += 1
+
+    def forget(self, key):
+        """
+        실행 중인 조회를 더 이상 새 요청과 공유하지 않음 (데이터가 바뀌었을 때 호출)
+        이미 기다리던 요청은 그 결과를 받고, 이후 요청은 새로 조회한다.
+        """
+        self._tasks.pop(key, None)
+
+    def stats(self):
+        return {**self._stats, "in_flight": len(self._tasks)}
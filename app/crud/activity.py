@@ -0,0 +1,41 @@
+# 회원 활동(마지막 로그인/접속 시각, 로그인 횟수) CRUD 함수 (aiomysql 비동기 커넥션 사용)
+# 커넥션은 호출하는 쪽에서 get_async_connection()으로 빌려서 넘겨준다.
+# commit/rollback도 호출하는 쪽에서 처리한다.
+#
+# users 테이블이 아니라 user_activity 테이블에 따로 저장한다.
+# - 로그인마다 users 행을 UPDATE하면 회원 조회/수정과 같은 행 잠금을 두고 다투게 되고 version(ETag)도 바뀜
+# - 쓰기는 app/services/activity.py 가 모아서 여러 행을 INSERT ... ON DUPLICATE KEY UPDATE 한 번으로 처리
+
+ACTIVITY_COLUMNS = "user_id, login_count, last_login_at, last_seen_at"
+
+
+async def upsert_activity(conn, rows):
+    """
+    rows: [(user_id, 로그인 횟수 증가분, 마지막 로그인 시각 또는 None, 마지막 접속 시각), ...]
+    여러 회원을 multi-row upsert 한 번으로 반영 (로그인 횟수는 더하고, 시각은 새 값으로)
+    """
+    if not rows:
+        return 0
+    placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+    args = [value for row in rows for value in row]
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            f"""
+            INSERT INTO user_activity ({ACTIVITY_COLUMNS}) VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE
+                login_count = login_count + VALUES(login_count),
+                last_login_at = COALESCE(VALUES(last_login_at), last_login_at),
+                last_seen_at = VALUES(last_seen_at)
+            """,
+            args
+        )
+        return cursor.rowcount
+
+
+async def get_activity(conn, user_id):
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            f"SELECT {ACTIVITY_COLUMNS} FROM user_activity WHERE user_id=%s",
+            (user_id,)
+        )
+        return await cursor.fetchone()
@@ -1 +1,72 @@
-# 게시글 CRUD 함수 정의 예정
+# 게시글 CRUD 함수 (aiomysql 비동기 커넥션 사용)
+# 커넥션은 호출하는 쪽(라우터)에서 get_async_connection()으로 빌려서 넘겨준다.
+# commit/rollback도 호출하는 쪽에서 처리한다.
+#
+# 목록은 (created_at, id) 기준 keyset 페이지네이션 (최신 글부터)
+# - 작성자별: idx_posts_author_created (author_id, created_at) 인덱스
+# - 전체 피드: idx_posts_created (created_at) 인덱스
+# 두 인덱스 모두 뒤에 PK(id)가 붙어 있으므로 ORDER BY created_at DESC, id DESC를 정렬 없이 인덱스 순서대로 읽는다.
+
+POST_COLUMNS = "id, author_id, title, content, created_at"
+
+# keyset 조건: 이전 페이지 마지막 글(before_created_at, before_id)보다 오래된 글
+# (MySQL은 (created_at, id) < (?, ?) 행 비교에 범위 인덱스를 잘 못 써서 풀어서 작성)
+_BEFORE = "(created_at < %s OR (created_at = %s AND id < %s))"
+
+
+async def insert_post(conn, author_id, title, content, created_at):
+    """게시글 생성 후 새 id 반환. 작성자의 post_count도 같은 트랜잭션에서 1 증가"""
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            "INSERT INTO posts (author_id, title, content, created_at) VALUES (%s, %s, %s, %s)",
+            (author_id, title, content, created_at)
+        )
+        post_id = cursor.lastrowid
+        await cursor.execute("UPDATE users SET post_count=post_count+1 WHERE id=%s", (author_id,))
+        return post_id
+
+
+async def get_post(conn, post_id):
+    async with conn.cursor() as cursor:
+        await cursor.execute(f"SELECT {POST_COLUMNS} FROM posts WHERE id=%s", (post_id,))
+        return await cursor.fetchone()
+
+
+async def list_posts(conn, limit, before=None):
+    """
+    전체 피드: 최신 글부터 limit개
+    before: 이전 페이지 마지막 글의 (created_at, id)
+    """
+    async with conn.cursor() as cursor:
+        if before is None:
+            await cursor.execute(
+                f"SELECT {POST_COLUMNS} FROM posts ORDER BY created_at DESC, id DESC LIMIT %s",
+                (limit,)
+            )
+        else:
+            created_at, post_id = before
+            await cursor.execute(
+                f"SELECT {POST_COLUMNS} FROM posts WHERE {_BEFORE} "
+                "ORDER BY created_at DESC, id DESC LIMIT %s",
+                (created_at, created_at, post_id, limit)
+            )
+        return await cursor.fetchall()
+
+
+async def list_posts_by_author(conn, author_id, limit, before=None):
+    """작성자 한 명의 글: 최신 글부터 limit개"""
+    async with conn.cursor() as cursor:
+        if before is None:
+            await cursor.execute(
+                f"SELECT {POST_COLUMNS} FROM posts WHERE author_id=%s "
+                "ORDER BY created_at DESC, id DESC LIMIT %s",
+                (author_id, limit)
+            )
+        else:
+            created_at, post_id = before
+            await cursor.execute(
+                f"SELECT {POST_COLUMNS} FROM posts WHERE author_id=%s AND {_BEFORE} "
+                "ORDER BY created_at DESC, id DESC LIMIT %s",
+                (author_id, created_at, created_at, post_id, limit)
+            )
+        return await cursor.fetchall()
@@ -0,0 +1,139 @@
+# 회원 CRUD 함수 (aiomysql 비동기 커넥션 사용)
+# 커넥션은 호출하는 쪽(라우터)에서 get_async_connection()으로 빌려서 넘겨준다.
+# commit/rollback도 호출하는 쪽에서 처리한다.
+from app.core.db import AsyncSSDictCursor
+
+# version: 수정할 때마다 1씩 증가하는 값 (ETag용, 응답 JSON에는 포함되지 않음)
+# post_count: 작성한 게시글 수 (게시글 작성자 정보에 사용)
+USER_COLUMNS = "id, name, email, created_at, version, post_count"
+
+
+async def list_users(conn, limit, after=None):
+    """
+    keyset 페이지네이션: id > after 인 사용자를 id 순으로 limit개 조회
+    OFFSET과 달리 PK 인덱스에서 바로 시작 위치를 찾으므로 뒤쪽 페이지도 빠르다.
+    """
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            f"SELECT {USER_COLUMNS} FROM users WHERE id > %s ORDER BY id LIMIT %s",
+            (after or 0, limit)
+        )
+        return await cursor.fetchall()
+
+
+async def iter_users(conn, after=None, batch_size=1000):
+    """
+    서버 사이드(unbuffered) 커서로 사용자를 한 묶음씩 읽어오는 async generator
+    전체 결과를 메모리에 올리지 않으므로 사용자가 수백만 명이어도 메모리 사용량이 일정하다.
+    """
+    async with conn.cursor(AsyncSSDictCursor) as cursor:
+        await cursor.execute(
+            f"SELECT {USER_COLUMNS} FROM users WHERE id > %s ORDER BY id",
+            (after or 0,)
+        )
+        while True:
+            rows = await cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row
+
+
+async def get_user(conn, user_id):
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            f"SELECT {USER_COLUMNS} FROM users WHERE id=%s",
+            (user_id,)
+        )
+        return await cursor.fetchone()
+
+
+async def get_users_by_ids(conn, user_ids):
+    """여러 사용자를 WHERE id IN (...) 한 번으로 조회 (게시글 목록의 작성자 정보 등)"""
+    if not user_ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(user_ids))
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            f"SELECT {USER_COLUMNS} FROM users WHERE id IN ({placeholders})",
+            tuple(user_ids)
+        )
+        return await cursor.fetchall()
+
+
+async def get_user_with_password_by_email(conn, email):
+    """로그인용: 비밀번호 해시까지 함께 조회"""
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            "SELECT id, name, email, password FROM users WHERE email=%s",
+            (email,)
+        )
+        return await cursor.fetchone()
+
+
+async def get_user_with_password(conn, user_id):
+    """비밀번호 확인용: id로 이메일과 비밀번호 해시 조회"""
+    async with conn.cursor() as cursor:
+        await cursor.execute("SELECT id, email, password FROM users WHERE id=%s", (user_id,))
+        return await cursor.fetchone()
+
+
+async def insert_user(conn, name, email, password_hash, created_at):
+    """
+    사용자 생성 후 새 id 반환
+    이메일 중복은 미리 SELECT로 확인하지 않고 UNIQUE 인덱스 위반(IntegrityError 1062)으로 알아낸다.
+    """
+    sql = """
+        INSERT INTO users (name, email, password, created_at)
+        VALUES (%s, %s, %s, %s)
+    """
+    async with conn.cursor() as cursor:
+        await cursor.execute(sql, (name, email, password_hash, created_at))
+        return cursor.lastrowid
+
+
+async def find_existing_emails(conn, emails):
+    """emails 중 이미 가입된 이메일 집합 (WHERE email IN (...) 한 번으로 조회)"""
+    if not emails:
+        return set()
+    placeholders = ", ".join(["%s"] * len(emails))
+    async with conn.cursor() as cursor:
+        await cursor.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", tuple(emails))
+        return {row['email'].lower() for row in await cursor.fetchall()}
+
+
+async def insert_users(conn, rows):
+    """
+    여러 사용자를 한 번에 생성 (rows: (name, email, password_hash, created_at) 목록)
+    executemany는 INSERT ... VALUES (...), (...), ... 여러 행짜리 문장으로 묶어서 보낸다.
+    생성된 id는 {이메일(소문자): id} 로 반환
+    """
+    sql = """
+        INSERT INTO users (name, email, password, created_at)
+        VALUES (%s, %s, %s, %s)
+    """
+    async with conn.cursor() as cursor:
+        await cursor.executemany(sql, rows)
+        emails = [row[1] for row in rows]
+        placeholders = ", ".join(["%s"] * len(emails))
+        await cursor.execute(f"SELECT id, email FROM users WHERE email IN ({placeholders})", tuple(emails))
+        return {row['email'].lower(): row['id'] for row in await cursor.fetchall()}
+
+
+async def update_user(conn, user_id, fields):
+    """
+    fields: {"name": ..., "email": ..., "password": ..., "updated_at": ...} 중 바꿀 컬럼만
+    UPDATE 한 번으로 처리하고 WHERE에 맞은 행 수를 반환 (0이면 없는 사용자)
+    version은 같은 UPDATE 문에서 1 증가시킨다.
+    """
+    update_fields = [f"{column}=%s" for column in fields] + ["version=version+1"]
+    sql = f"UPDATE users SET {', '.join(update_fields)} WHERE id=%s"
+    async with conn.cursor() as cursor:
+        await cursor.execute(sql, (*fields.values(), user_id))
+        return cursor.rowcount
+
+
+async def delete_user(conn, user_id):
+    async with conn.cursor() as cursor:
+        await cursor.execute("DELETE FROM users WHERE id=%s", (user_id,))
+        return cursor.rowcount
@@ -0,0 +1,398 @@
+# 운영용 실행기: app.main:app 을 워커 프로세스 여러 개로 실행
+# run.bat(uvicorn 프로세스 1개)은 CPU 코어를 하나만 쓰고, 재시작하면 처리 중인 요청이 끊긴다.
+#
+# 실행 방법)
+#   python -m app.launcher                      # 워커 = CPU 코어 수
+#   python -m app.launcher --workers 4 --port 8000
+#
+# - preload: 앱을 부모 프로세스에서 한 번 import한 뒤 fork -> import한 코드/템플릿은 워커들이 copy-on-write로 공유
+#   (--no-preload 또는 WEB_PRELOAD=0 이면 워커마다 import. 이때는 SIGHUP으로 새 코드를 읽어 들일 수 있음)
+# - DB 커넥션 예산(DB_MAX_CONNECTIONS)을 워커 수로 나눠서 워커별 풀 크기(DB_POOL_MAX)를 정함
+# - SIGTERM/SIGINT: 새 연결을 받지 않고 처리 중인 요청이 끝날 때까지 기다렸다가 종료 (WEB_GRACEFUL_TIMEOUT초)
+# - SIGHUP: 워커를 하나씩 교체 (새 워커가 준비된 뒤에 기존 워커를 종료하므로 끊기는 요청 없음)
+# - 워커는 WEB_MAX_REQUESTS개(+무작위 지터)를 처리하면 부모에게 교체를 요청하고, 부모가 새 워커를 띄워 준비된 뒤에
+#   기존 워커를 정상 종료시킨다 (메모리 증가 억제, 한 번에 하나씩). 부모가 응답하지 않으면 그 2배에서 스스로 종료
+# - 앱 import 시간, 워커별 시작 시간(lifespan 포함), 전체 준비 시간을 로그로 남김
+#
+# 주의) 워커끼리는 메모리를 공유하지 않으므로 SESSION_BACKEND=file (또는 공유 저장소) 필요
+#       같은 이유로 워커가 2개 이상이면 회원 캐시의 프로세스 내 캐시를 끈다 (USER_CACHE_LOCAL=0)
+# Windows에는 fork가 없으므로 uvicorn의 --workers 로 실행 (preload 없음). 풀 크기/세션/회원 캐시 설정은 똑같이 적용
+import argparse
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+APP = "app.main:app"
+
+logger = logging.getLogger("app.launcher")
+
+# 새 워커가 준비(lifespan 완료)될 때까지 기다리는 최대 시간(초)
+WORKER_STARTUP_TIMEOUT = 60
+# 준비되기 전에 죽은 워커를 다시 띄우기 전 대기 시간(초) (설정 오류로 무한히 fork하지 않도록)
+WORKER_RESPAWN_DELAY = 1.0
+# 교체를 요청한 워커가 부모의 종료 신호 없이 이 배수만큼 처리하면 스스로 종료 (부모가 교체하지 못할 때 대비)
+WORKER_RECYCLE_HARD_FACTOR = 2
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def parse_args(argv=None):
+    cpu = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(prog="python -m app.launcher", description="app.main:app 멀티 워커 실행기")
+    parser.add_argument("--host", default=os.getenv('WEB_HOST', '127.0.0.1'))
+    parser.add_argument("--port", type=int, default=_env_int('WEB_PORT', 8000))
+    parser.add_argument("--workers", type=int, default=_env_int('WEB_WORKERS', cpu), help="워커 수 (기본: CPU 코어 수)")
+    parser.add_argument("--max-requests", type=int, default=_env_int('WEB_MAX_REQUESTS', 10000),
+                        help="워커가 이만큼 처리하면 교체 (0이면 교체 안 함)")
+    parser.add_argument("--max-requests-jitter", type=int, default=_env_int('WEB_MAX_REQUESTS_JITTER', -1),
+                        help="워커마다 더할 무작위 요청 수 최댓값 (기본: max-requests의 10%%, 워커들이 한꺼번에 교체되지 않도록)")
+    parser.add_argument("--graceful-timeout", type=int, default=_env_int('WEB_GRACEFUL_TIMEOUT', 30),
+                        help="종료/교체 시 처리 중인 요청을 기다리는 시간(초)")
+    parser.add_argument("--db-max-connections", type=int, default=_env_int('DB_MAX_CONNECTIONS', 100),
+                        help="모든 워커가 DB 하나에 여는 커넥션 수 합계 (MySQL max_connections보다 작게)")
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        default=os.getenv('WEB_PRELOAD', '1') == '1', help="부모 프로세스에서 앱을 미리 import하지 않음")
+    args = parser.parse_args(argv)
+    args.workers = max(1, args.workers)
+    if args.max_requests_jitter < 0:
+        args.max_requests_jitter = args.max_requests // 10
+    return args
+
+
+def configure_workers(args):
+    """
+    워커 수에 맞춰 워커별 풀 크기를 환경변수로 정한다 (앱을 import하기 전에 호출해야 함)
+    직접 설정한 값(DB_POOL_MAX, DB_SYNC_POOL_MAX, PASSWORD_HASH_WORKERS)은 그대로 둔다.
+    """
+    # 워커마다 풀이 두 개: 비동기 풀(요청 처리, DB_POOL_MAX)과 동기 풀(마이그레이션/SQLAlchemy 세션, DB_SYNC_POOL_MAX)
+    # 워커 몫의 대부분을 비동기 풀에 주고 동기 풀은 1/5만.
+    # 복제본(MYSQL_REPLICA_HOSTS)도 서버마다 같은 크기이므로 복제본 하나당 예산도 같다.
+    per_worker = max(2, args.db_max_connections // args.workers)
+    if not os.getenv('DB_SYNC_POOL_MAX'):
+        os.environ['DB_SYNC_POOL_MAX'] = str(max(1, per_worker // 5))
+    sync_max = int(os.environ['DB_SYNC_POOL_MAX'])
+    if not os.getenv('DB_POOL_MAX'):
+        os.environ['DB_POOL_MAX'] = str(max(1, per_worker - sync_max))
+    pool_max = int(os.environ['DB_POOL_MAX'])
+    if int(os.getenv('DB_POOL_MIN', '1')) > min(pool_max, sync_max):
+        os.environ['DB_POOL_MIN'] = str(min(pool_max, sync_max))
+    if (pool_max + sync_max) * args.workers > args.db_max_connections:
+        logger.warning("DB 커넥션이 예산보다 많아질 수 있음: 워커 %d개 x (DB_POOL_MAX %d + DB_SYNC_POOL_MAX %d) > DB_MAX_CONNECTIONS %d",
+                       args.workers, pool_max, sync_max, args.db_max_connections)
+    # bcrypt 프로세스 풀은 워커마다 따로 생기므로 코어 수를 워커끼리 나눠 쓴다
+    if not os.getenv('PASSWORD_HASH_WORKERS'):
+        os.environ['PASSWORD_HASH_WORKERS'] = str(max(1, (os.cpu_count() or 1) // args.workers))
+    if args.workers > 1 and os.getenv('SESSION_BACKEND', 'memory').lower() == 'memory':
+        logger.warning("SESSION_BACKEND=memory 는 워커끼리 세션을 공유하지 않음 (로그인이 풀릴 수 있음). "
+                       "SESSION_BACKEND=file 사용 권장")
+    # 회원 캐시(로그인 캐시, ETag 버전 맵 포함)는 워커마다 따로라서 다른 워커의 invalidate가 닿지 않는다
+    if args.workers > 1:
+        if not os.getenv('USER_CACHE_LOCAL'):
+            os.environ['USER_CACHE_LOCAL'] = '0'
+        elif os.environ['USER_CACHE_LOCAL'] == '1':
+            logger.warning("USER_CACHE_LOCAL=1 은 워커끼리 회원 캐시를 무효화하지 못함 (바꾸기 전 비밀번호나 탈퇴한 계정으로 "
+                           "로그인될 수 있음). USER_CACHE_LOCAL=0 (필요하면 CACHE_BACKEND=redis) 사용 권장")
+    logger.info("워커 %d개, 워커별 DB_POOL_MAX=%s, DB_SYNC_POOL_MAX=%s, PASSWORD_HASH_WORKERS=%s",
+                args.workers, pool_max, sync_max, os.environ['PASSWORD_HASH_WORKERS'])
+
+
+def _bind(host, port):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _worker_server_class():
+    import uvicorn
+
+    class WorkerServer(uvicorn.Server):
+        """
+        lifespan(DB 풀 준비 등)까지 끝나면 부모에게 '준비 완료'와 걸린 시간을 알리는 uvicorn 서버
+        recycle_at개를 처리하면 부모에게 교체를 요청하고, 부모가 보내는 SIGTERM을 기다리며 계속 처리한다
+        """
+
+        def __init__(self, config, ready_fd, forked_at, recycle_at=None):
+            super().__init__(config)
+            self.ready_fd = ready_fd
+            self.forked_at = forked_at
+            self.recycle_at = recycle_at
+            self.recycle_requested = False
+
+        async def startup(self, sockets=None):
+            await super().startup(sockets=sockets)
+            if self.started:
+                elapsed = time.monotonic() - self.forked_at
+                os.write(self.ready_fd, f"{os.getpid()} {elapsed:.3f}\n".encode())
+
+        async def on_tick(self, counter):
+            if await super().on_tick(counter):
+                return True
+            if self.recycle_at and not self.recycle_requested and self.server_state.total_requests >= self.recycle_at:
+                self.recycle_requested = True
+                os.write(self.ready_fd, f"{os.getpid()} recycle\n".encode())
+            return False
+
+    return WorkerServer
+
+
+class Launcher:
+    def __init__(self, args, app=None, started_at=None):
+        self.args = args
+        self.app = app                 # preload한 앱 (없으면 워커가 import)
+        self.sock = _bind(args.host, args.port)
+        self.ready_r, self.ready_w = os.pipe()
+        self.workers = {}              # pid -> 시작 시각(monotonic)
+        self.ready = {}                # pid -> 시작에 걸린 시간(초)
+        self.recycle = []              # 교체를 요청한 워커 pid (요청 순서대로 하나씩 교체)
+        self.stopping = False
+        self.reloading = False
+        self.started_at = started_at or time.monotonic()   # 실행기 시작 시각 (preload 포함)
+        self.reported = False
+        self.next_spawn_at = 0.0
+        self.stats = {"spawned": 0, "exited": 0, "failed_startup": 0, "recycled": 0}
+
+    # ---- 워커 ----
+
+    def spawn(self):
+        forked_at = time.monotonic()
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = forked_at
+            self.stats["spawned"] += 1
+            return pid
+        # 자식(워커) 프로세스
+        status = 1
+        try:
+            self._run_worker(forked_at)
+            status = 0
+        except BaseException:
+            logger.exception("워커 실행 중 오류")
+        finally:
+            os._exit(status)
+
+    def _run_worker(self, forked_at):
+        import random
+
+        import uvicorn
+
+        # SIGTERM/SIGINT는 uvicorn이 처리(정상 종료), SIGHUP(교체)은 부모만 처리
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        os.close(self.ready_r)
+        args = self.args
+        # 워커마다 교체 시점을 다르게 해서 한꺼번에 교체를 요청하지 않도록 (random은 fork 후 다시 시드됨)
+        recycle_at = args.max_requests + random.randint(0, args.max_requests_jitter) if args.max_requests else None
+        config = uvicorn.Config(
+            self.app or APP,
+            lifespan="on",
+            limit_max_requests=recycle_at * WORKER_RECYCLE_HARD_FACTOR if recycle_at else None,
+            timeout_graceful_shutdown=args.graceful_timeout,
+        )
+        server = _worker_server_class()(config, self.ready_w, forked_at, recycle_at)
+        server.run(sockets=[self.sock])
+
+    def reap(self):
+        """종료된 워커 정리 (교체 없이 끝난 워커는 maintain()에서 새로 띄움)"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.workers.pop(pid, None)
+            self.stats["exited"] += 1
+            status = os.waitstatus_to_exitcode(status)
+            if self.ready.pop(pid, None) is None:
+                # 준비되기 전에 죽음 (import 오류, lifespan 실패 등)
+                self.stats["failed_startup"] += 1
+                self.next_spawn_at = time.monotonic() + WORKER_RESPAWN_DELAY
+                logger.error("워커 %d가 시작 중에 종료됨 (status=%d)", pid, status)
+            elif not self.stopping:
+                logger.info("워커 %d 종료 (status=%d)", pid, status)
+
+    def maintain(self):
+        """워커 수를 설정한 수로 유지"""
+        while not self.stopping and len(self.workers) < self.args.workers:
+            if time.monotonic() < self.next_spawn_at:
+                break
+            self.spawn()
+
+    def read_ready(self, timeout):
+        """워커의 준비 완료 알림 읽기 (시그널을 놓치지 않도록 짧게 기다림)"""
+        try:
+            readable, _, _ = select.select([self.ready_r], [], [], timeout)
+        except InterruptedError:
+            return
+        if not readable:
+            return
+        for line in os.read(self.ready_r, 65536).decode().splitlines():
+            pid, message = line.split()
+            pid = int(pid)
+            if pid not in self.workers:
+                continue
+            if message == "recycle":
+                if pid not in self.recycle:
+                    self.recycle.append(pid)
+            else:
+                self.ready[pid] = float(message)
+                logger.info("워커 %d 준비 완료 (%.2f초)", pid, float(message))
+        if not self.reported and len(self.ready) >= self.args.workers:
+            self.reported = True
+            times = list(self.ready.values())
+            logger.info("워커 %d개 준비 완료: 전체 %.2f초 (워커 시작 평균 %.2f초, 최대 %.2f초)",
+                        len(times), time.monotonic() - self.started_at, sum(times) / len(times), max(times))
+
+    def wait_ready(self, pid, timeout):
+        deadline = time.monotonic() + timeout
+        while pid in self.workers and pid not in self.ready and time.monotonic() < deadline and not self.stopping:
+            self.read_ready(0.2)
+            self.reap()
+        return pid in self.ready
+
+    def replace(self, old):
+        """새 워커를 띄워 준비된 뒤에 기존 워커를 정상 종료시킨다. 새 워커가 준비되지 않으면 기존 워커 유지 후 False"""
+        new = self.spawn()
+        if not self.wait_ready(new, WORKER_STARTUP_TIMEOUT):
+            logger.error("새 워커 %d가 준비되지 않아 교체 중단 (기존 워커 %d 유지)", new, old)
+            self._signal(new, signal.SIGTERM)
+            return False
+        self._signal(old, signal.SIGTERM)
+        return True
+
+    def rolling_restart(self):
+        """워커를 하나씩 교체: 새 워커가 준비된 뒤에 기존 워커를 정상 종료시킨다"""
+        logger.info("워커 %d개 순차 교체 시작", len(self.workers))
+        for old in list(self.workers):
+            if self.stopping:
+                break
+            if not self.replace(old):
+                return
+        # 교체를 요청했던 워커도 모두 바뀜
+        self.recycle.clear()
+        logger.info("워커 순차 교체 완료")
+
+    def recycle_workers(self):
+        """요청 수 제한에 닿은 워커를 하나씩 교체 (동시에 여러 워커를 내리지 않음)"""
+        while self.recycle and not self.stopping and not self.reloading:
+            old = self.recycle.pop(0)
+            if old not in self.workers:
+                continue
+            logger.info("워커 %d 요청 수 제한 도달: 새 워커로 교체", old)
+            if not self.replace(old):
+                # 기존 워커는 스스로 종료하는 한도(WORKER_RECYCLE_HARD_FACTOR배)까지 계속 처리
+                return
+            self.stats["recycled"] += 1
+
+    def _signal(self, pid, sig):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    # ---- 부모 프로세스 ----
+
+    def _on_stop(self, signum, frame):
+        self.stopping = True
+
+    def _on_reload(self, signum, frame):
+        self.reloading = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+        logger.info("http://%s:%d 에서 대기 (부모 pid %d)", self.args.host, self.args.port, os.getpid())
+        self.maintain()
+        while not self.stopping:
+            self.read_ready(0.5)
+            self.reap()
+            if self.reloading:
+                self.reloading = False
+                self.rolling_restart()
+            self.recycle_workers()
+            self.maintain()
+        self.shutdown()
+
+    def shutdown(self):
+        """모든 워커에 SIGTERM -> 처리 중인 요청이 끝나길 기다림 -> 시간이 지나면 SIGKILL"""
+        logger.info("종료 중: 워커 %d개가 처리 중인 요청을 마치길 기다림 (최대 %d초)",
+                    len(self.workers), self.args.graceful_timeout)
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+        # uvicorn의 대기 시간 + lifespan 종료(남은 기록 flush, 풀 정리) 여유
+        deadline = time.monotonic() + self.args.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            logger.warning("워커 %d 강제 종료", pid)
+            self._signal(pid, signal.SIGKILL)
+        while self.workers:
+            self.reap()
+            time.sleep(0.05)
+        self.sock.close()
+        logger.info("종료 완료 (띄운 워커 %d개, 요청 수 제한으로 교체 %d개)", self.stats["spawned"], self.stats["recycled"])
+
+
+def build_assets():
+    """정적 파일은 fork 전에 부모에서 한 번만 빌드 (워커들이 같은 .assets/에 동시에 쓰지 않도록 워커는 로드만)"""
+    if os.getenv('ASSET_BUILD_ON_STARTUP', '1') != '1':
+        return
+    os.environ['ASSET_BUILD_ON_STARTUP'] = '0'
+    from app.core import assets
+
+    assets.ASSET_BUILD_ON_STARTUP = False
+    start = time.perf_counter()
+    assets.build()
+    logger.info("정적 파일 빌드 %.2f초", time.perf_counter() - start)
+
+
+def preload():
+    """부모 프로세스에서 앱 import (걸린 시간 로그). 이후 fork한 워커들이 메모리를 공유"""
+    from uvicorn.importer import import_from_string
+
+    start = time.perf_counter()
+    app = import_from_string(APP)
+    # import로 만들어진 객체를 GC 대상에서 빼서, 워커에서 GC가 돌 때 공유 메모리 페이지를 건드리지(복사하지) 않게 함
+    gc.freeze()
+    logger.info("앱 import %.2f초 (preload, 워커들이 공유)", time.perf_counter() - start)
+    return app
+
+
+def main(argv=None):
+    started_at = time.monotonic()
+    from app.core import config  # noqa: F401  (.env 로드)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [launcher] %(levelname)s %(message)s")
+    args = parse_args(argv)
+    # fork가 없는 OS에서도 먼저 호출: uvicorn이 띄우는 워커 프로세스도 이 환경변수를 물려받는다
+    configure_workers(args)
+    build_assets()
+    if not hasattr(os, "fork"):
+        import uvicorn
+
+        logger.warning("fork를 지원하지 않는 OS: uvicorn --workers %d 로 실행 (preload 없음, 요청 수 제한에 닿은 워커는 "
+                       "새 워커가 준비되기 전에 종료됨)", args.workers)
+        uvicorn.run(APP, host=args.host, port=args.port, workers=args.workers,
+                    limit_max_requests=args.max_requests or None,
+                    limit_max_requests_jitter=args.max_requests_jitter if args.max_requests else 0,
+                    timeout_graceful_shutdown=args.graceful_timeout)
+        return
+    app = preload() if args.preload else None
+    Launcher(args, app, started_at).run()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
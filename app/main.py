@@ -1,16 +1,54 @@
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import posts
 from app.api import users
+from app.api import stats
 from app.api.login import router as login_router
-from starlette.middleware.sessions import SessionMiddleware
+from app.core import compression, metrics
+from app.core.assets import StaticAssets, init_assets
+from app.core import db
+from app.core.db import get_async_connection
+from app.core.pages import LOGIN_REQUIRED, prerender, render_fragment, render_page, stream_page
+from app.crud import user as crud_user
+from app.core.schema import prepare_schema
+from app.services import activity, password_service
+from starlette.concurrency import run_in_threadpool
+from app.core import session
+from app.core.session import ServerSessionMiddleware, create_session_backend
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 필요한 테이블/컬럼/인덱스 생성 (python -m app.core.schema 와 동일, 이미 있으면 아무것도 안 함)
+    # DB_AUTO_MIGRATE=0 이면 확인만 하고, 없으면 서버를 띄우지 않음
+    await run_in_threadpool(prepare_schema, os.getenv('DB_AUTO_MIGRATE', '1') == '1')
+    # DB 커넥션 풀 생성 + 미리 연결 (첫 요청이 접속 비용을 떠안지 않도록)
+    await db.startup()
+    # 로그인/접속 기록을 모아서 주기적으로 DB에 쓰는 백그라운드 태스크
+    activity.start()
+    # 만료된 세션 파일 정리 (SESSION_BACKEND=file)
+    session.start_sweeper(session_backend)
+    # 정적 파일 해시 이름/압축본 빌드 후 메모리에 로드 (페이지 렌더링 전에 해야 해시 주소가 들어감)
+    await run_in_threadpool(init_assets)
+    # 로그인 안 한 상태의 페이지를 미리 렌더링 (첫 요청부터 캐시된 HTML로 응답)
+    prerender()
+    yield
+    # 서버 종료 시 정리
+    password_service.shutdown()
+    await session.stop_sweeper()
+    # 버퍼에 남은 로그인 기록은 DB 풀을 닫기 전에 모두 flush
+    await activity.stop()
+    await db.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# 회원목록 페이지에서 한 번에 그리는 회원 수 (첫 화면, "더 보기" 한 번)
+USERS_PAGE_SIZE = int(os.getenv('USERS_PAGE_SIZE', '50'))
 
 # CORS 미들웨어 추가
 app.add_middleware(
@@ -21,39 +59,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(SessionMiddleware, secret_key="supersecret")
+# 서버 사이드 세션: 쿠키에는 세션 id만, 내용은 SESSION_BACKEND(memory|file) 저장소에
+# (저장소는 lifespan의 만료 세션 정리도 같이 사용)
+session_backend = create_session_backend()
+app.add_middleware(
+    ServerSessionMiddleware,
+    backend=session_backend,
+    max_age=int(os.getenv('SESSION_TTL', str(14 * 24 * 3600))),
+)
+
+# 응답 압축 (gzip/br, 작은 응답과 이미 압축된 응답은 건너뜀, 스트리밍 응답은 조각 단위로 압축)
+# 계측 미들웨어 안쪽에 두어서 압축 시간도 응답시간에 포함
+if compression.COMPRESSION_ENABLED:
+    app.add_middleware(compression.CompressionMiddleware)
+
+# 요청 지연시간/DB 사용량 계측 + Server-Timing 헤더 (METRICS_ENABLED=0 이면 사용 안 함)
+# 가장 바깥에서 전체 처리 시간을 재도록 마지막에 추가
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-templates = Jinja2Templates(directory="app/templates")
+# 정적 파일: 해시 이름은 영구 캐시, Accept-Encoding에 따라 미리 압축한 br/gzip 응답
+app.mount("/static", StaticAssets(directory="app/static"), name="static")
 
+# HTML 페이지는 app/core/pages.py 에서 (템플릿, 로그인 상태)별로 렌더링 결과를 캐시해서 응답 (ETag/304 지원)
 @app.get("/users/list", response_class=HTMLResponse)
 async def users_page(request: Request):
     if not request.session.get("user_id"):
-        return templates.TemplateResponse("users.html", {"request": request, "auth_message": "로그인 해야 이용 가능합니다."})
-    return templates.TemplateResponse("users.html", {"request": request, "auth_message": None})
+        return render_page(request, "users.html", auth_message=LOGIN_REQUIRED)
+    # 첫 페이지 회원 목록은 서버에서 바로 그려서 같은 응답에 이어서 보낸다 (브라우저의 두 번째 요청 없음)
+    readonly = db.can_use_replica(request.session)
+    return stream_page(request, "users.html", lambda: _render_user_rows(None, readonly))
+
+@app.get("/users/list/rows", response_class=HTMLResponse)
+async def users_page_rows(request: Request, after: int = Query(None, ge=0)):
+    """회원목록 "더 보기": after 다음 회원들의 <tr> 조각 (keyset 페이지네이션)"""
+    if not request.session.get("user_id"):
+        return HTMLResponse(status_code=401)
+    return HTMLResponse(await _render_user_rows(after, db.can_use_replica(request.session)), headers={"Cache-Control": "private, no-cache"})
+
+async def _render_user_rows(after, readonly=False):
+    # 한 개 더 읽어서 다음 페이지가 있는지 판단
+    async with get_async_connection(readonly=readonly) as conn:
+        rows = await crud_user.list_users(conn, USERS_PAGE_SIZE + 1, after)
+    next_cursor = rows[USERS_PAGE_SIZE - 1]['id'] if len(rows) > USERS_PAGE_SIZE else None
+    return render_fragment("users_rows.html", users=rows[:USERS_PAGE_SIZE], next_cursor=next_cursor)
 
 # 마이페이지 라우트가 없으면 추가
 @app.get("/mypage", response_class=HTMLResponse)
 async def mypage(request: Request):
     if not request.session.get("user_id"):
-        print("No user_id in session, redirecting to home.")
         # return RedirectResponse("/", status_code=302)
          # 로그인 안 했으면 안내 메시지와 함께 렌더링
-        return templates.TemplateResponse(
-            "mypage.html",
-            {"request": request, "auth_message": "로그인 해야 이용 가능합니다."}
-        )
-    print("user_id found in session:", request.session.get("user_id"))
-    return templates.TemplateResponse("mypage.html", {"request": request})
+        return render_page(request, "mypage.html", auth_message=LOGIN_REQUIRED)
+    return render_page(request, "mypage.html")
 
 @app.get("/", response_class=HTMLResponse)
 async def index_page(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return render_page(request, "index.html")
 
 @app.get("/signup", response_class=HTMLResponse)
 async def signup_page(request: Request):
-    return templates.TemplateResponse("signup.html", {"request": request})
+    return render_page(request, "signup.html")
 
 app.include_router(posts.router)
 app.include_router(users.router)
 app.include_router(login_router)
+app.include_router(stats.router)
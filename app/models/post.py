@@ -1 +1,2 @@
-# 게시글 SQLAlchemy 모델 정의 예정
+# 게시글 테이블은 SQL로 직접 정의 (app/models/post.sql, app/core/schema.py 참고)
+# SQLAlchemy 모델은 사용하지 않음
@@ -0,0 +1,13 @@
+-- MySQL posts 테이블 생성 예시
+CREATE TABLE posts (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    author_id INT NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME DEFAULT NULL,
+    -- 작성자별 목록 (author_id=? ORDER BY created_at DESC, id DESC)
+    KEY idx_posts_author_created (author_id, created_at),
+    -- 전체 피드 (ORDER BY created_at DESC, id DESC)
+    KEY idx_posts_created (created_at)
+);
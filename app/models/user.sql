@@ -2,8 +2,14 @@
 CREATE TABLE users (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
-    email VARCHAR(255) NOT NULL UNIQUE,
+    email VARCHAR(255) NOT NULL,
     password VARCHAR(255) NOT NULL,
     created_at DATETIME NOT NULL,
-    updated_at DATETIME DEFAULT NULL
+    updated_at DATETIME DEFAULT NULL,
+    -- 수정할 때마다 1씩 증가 (ETag/조건부 GET에 사용)
+    version INT NOT NULL DEFAULT 1,
+    -- 작성한 게시글 수 (게시글 작성 시 같은 트랜잭션에서 +1, 목록에서 COUNT(*) 없이 사용)
+    post_count INT NOT NULL DEFAULT 0,
+    -- 회원가입/수정 API는 이 UNIQUE 인덱스로 이메일 중복을 판단함 (app/core/schema.py 참고)
+    UNIQUE KEY uq_users_email (email)
 );
@@ -0,0 +1,9 @@
+-- MySQL user_activity 테이블 생성 예시
+-- 로그인/접속 기록 (app/services/activity.py 가 메모리에 모았다가 여러 행을 한 번에 upsert)
+CREATE TABLE user_activity (
+    user_id INT PRIMARY KEY,
+    -- 로그인 횟수 (flush마다 모인 횟수만큼 더함)
+    login_count INT NOT NULL DEFAULT 0,
+    last_login_at DATETIME DEFAULT NULL,
+    last_seen_at DATETIME DEFAULT NULL
+);
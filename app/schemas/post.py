@@ -1 +1,22 @@
-# 게시글 Pydantic 스키마 정의 예정
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class PostCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    content: str = Field(..., min_length=1, max_length=20000)
+
+class PostAuthor(BaseModel):
+    id: int
+    name: str
+    post_count: int
+    # 작성자 정보는 게시글마다 조회하지 않고 목록 전체의 작성자를 한 번에 조회해서 붙인다
+
+class PostOut(BaseModel):
+    id: int
+    author_id: int
+    title: str
+    content: str
+    created_at: datetime
+    author: Optional[PostAuthor] = None
+    # 탈퇴한 회원의 글이면 author는 None
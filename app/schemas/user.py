@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):    
@@ -27,3 +27,22 @@ class UserOut(UserBase):
         # dict가 아니라 클래스 객체를 넣어도 자동으로 모델로 변환해주는 기능
         # Pydantic은 기본적으로 “딕셔너리만 이해”하기 때문에,
         # 클래스 객체는 처리 못 함.
+
+
+# 한 번에 조회할 수 있는 최대 회원 수 (GET/POST /users/batch)
+USER_BATCH_MAX = 5000
+
+class UserBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=USER_BATCH_MAX)
+    # 여러 회원을 한 번에 조회할 때 (POST /users/batch)
+
+class UserBatchOut(BaseModel):
+    users: List[UserOut]
+    not_found: List[int]
+    # users는 요청한 id 순서대로 (중복 제거), 없는 id는 not_found
+
+class UserActivityOut(BaseModel):
+    login_count: int
+    last_login_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    # GET /users/me/activity 응답 (user_activity 테이블 + 아직 쓰지 않은 기록)
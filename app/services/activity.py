@@ -0,0 +1,201 @@
+# 로그인/접속 기록 write-behind 버퍼
+# 로그인할 때마다 UPDATE를 바로 실행하면 가장 많이 호출되는 경로에 동기 쓰기와 행 잠금이 생긴다.
+# 대신 메모리에 모아 두었다가 백그라운드 태스크가 여러 회원을 multi-row upsert 한 번으로 쓴다.
+# - 같은 회원의 기록은 하나로 합침 (로그인 횟수는 더하고, 시각은 마지막 값)
+# - ACTIVITY_FLUSH_INTERVAL초마다, 또는 모인 회원이 ACTIVITY_FLUSH_SIZE명이 되면 바로 flush
+# - 메모리 상한: 모인 회원이 ACTIVITY_BUFFER_MAX명이면 새 회원의 기록은 버림 (dropped)
+# - DB 쓰기에 실패하면 버퍼에 되돌려 다음 flush에서 다시 시도
+# - 서버 종료 시(lifespan) 남은 기록을 모두 flush
+# 프로세스가 비정상 종료되면 마지막 flush 이후의 기록은 사라진다 (통계성 데이터라 허용).
+#
+# 사용 예)
+#   activity.record_login(user['id'])    # POST /login 성공
+#   activity.record_seen(user_id)        # 로그인한 사용자의 API 요청
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from app.core import metrics
+from app.core.db import get_async_connection
+from app.crud import activity as crud_activity
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_ENABLED = os.getenv('ACTIVITY_ENABLED', '1') == '1'
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL', '5'))
+ACTIVITY_FLUSH_SIZE = int(os.getenv('ACTIVITY_FLUSH_SIZE', '500'))
+ACTIVITY_BUFFER_MAX = int(os.getenv('ACTIVITY_BUFFER_MAX', '50000'))
+
+# 회원 id -> [로그인 횟수, 마지막 로그인 시각, 마지막 접속 시각, 처음 기록된 시점(monotonic)]
+# 기록(record_*)과 flush는 이벤트 루프에서 실행되지만, /stats·/metrics(동기 def 라우트)는 스레드풀에서
+# activity_stats()로 버퍼를 읽으므로 잠금으로 보호 (잠금 없이 읽으면 순회 중 dict 크기가 바뀌는 오류)
+_pending = {}
+_lock = threading.Lock()
+_loop = None
+_wakeup = None
+_task = None
+
+_stats = {
+    "events": 0,
+    "coalesced": 0,
+    "dropped": 0,
+    "flushes": 0,
+    "batches": 0,
+    "rows": 0,
+    "errors": 0,
+    "last_flush_rows": 0,
+    "last_flush_lag_seconds": 0.0,
+}
+
+
+def record_login(user_id):
+    _record(user_id, True)
+
+
+def record_seen(user_id):
+    _record(user_id, False)
+
+
+def _record(user_id, login):
+    if not ACTIVITY_ENABLED:
+        return
+    # DATETIME 컬럼은 초 단위
+    now = datetime.now().replace(microsecond=0)
+    with _lock:
+        _stats["events"] += 1
+        entry = _pending.get(user_id)
+        if entry is None:
+            if len(_pending) >= ACTIVITY_BUFFER_MAX:
+                _stats["dropped"] += 1
+                return
+            entry = _pending[user_id] = [0, None, now, time.monotonic()]
+        else:
+            _stats["coalesced"] += 1
+        if login:
+            entry[0] += 1
+            entry[1] = now
+        entry[2] = now
+        full = len(_pending) >= ACTIVITY_FLUSH_SIZE
+    if full:
+        _wake()
+
+
+def _wake():
+    # 지금은 이벤트 루프에서만 불리지만, 동기 def 라우트(스레드풀)에서 기록해도 안전하도록 루프 쪽에서 깨움
+    if _loop is not None and not _wakeup.is_set():
+        _loop.call_soon_threadsafe(_wakeup.set)
+
+
+def _requeue(entries):
+    """쓰지 못한 기록을 버퍼에 되돌림 (그 사이 새로 들어온 기록과 합침)"""
+    with _lock:
+        for user_id, (logins, last_login, last_seen, first) in entries:
+            entry = _pending.get(user_id)
+            if entry is None:
+                if len(_pending) >= ACTIVITY_BUFFER_MAX:
+                    _stats["dropped"] += 1
+                    continue
+                _pending[user_id] = [logins, last_login, last_seen, first]
+                continue
+            entry[0] += logins
+            entry[1] = entry[1] or last_login
+            entry[3] = min(entry[3], first)
+
+
+async def flush():
+    """버퍼에 모인 기록을 DB에 쓰고 쓴 회원 수를 반환 (ACTIVITY_FLUSH_SIZE명씩 upsert)"""
+    global _pending
+    with _lock:
+        batch, _pending = _pending, {}
+    if not batch:
+        return 0
+    # 회원 id 순서로 쓴다 (여러 워커가 동시에 flush해도 행 잠금 순서가 같아서 교착 상태가 생기지 않음)
+    entries = sorted(batch.items())
+    lag = time.monotonic() - min(entry[3] for entry in batch.values())
+    written = 0
+    for start in range(0, len(entries), ACTIVITY_FLUSH_SIZE):
+        chunk = entries[start:start + ACTIVITY_FLUSH_SIZE]
+        rows = [(user_id, logins, last_login, last_seen) for user_id, (logins, last_login, last_seen, _) in chunk]
+        try:
+            async with get_async_connection() as conn:
+                await crud_activity.upsert_activity(conn, rows)
+                await conn.commit()
+        except asyncio.CancelledError:
+            _requeue(entries[start:])
+            raise
+        except Exception:
+            logger.exception("로그인 기록 flush 실패 (%d명, 다음 flush에서 재시도)", len(chunk))
+            _stats["errors"] += 1
+            _requeue(chunk)
+            continue
+        written += len(chunk)
+        _stats["batches"] += 1
+        metrics.record_activity_batch(len(chunk))
+    _stats["flushes"] += 1
+    _stats["rows"] += written
+    _stats["last_flush_rows"] = written
+    _stats["last_flush_lag_seconds"] = round(lag, 3)
+    metrics.record_activity_flush(lag)
+    return written
+
+
+async def _flush_loop():
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), ACTIVITY_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        try:
+            await flush()
+        except Exception:
+            logger.exception("로그인 기록 flush 중 오류")
+
+
+def start():
+    """lifespan 시작 시 호출: 주기적으로 flush하는 백그라운드 태스크 시작"""
+    global _loop, _wakeup, _task
+    if not ACTIVITY_ENABLED or _task is not None:
+        return
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    _task = asyncio.create_task(_flush_loop())
+
+
+async def stop():
+    """lifespan 종료 시 호출 (DB 풀을 닫기 전에): 백그라운드 태스크를 멈추고 남은 기록을 모두 flush"""
+    global _loop, _task
+    if _task is not None:
+        task, _task = _task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _loop = None
+    await flush()
+
+
+def pending(user_id):
+    """아직 DB에 쓰지 않은 회원의 기록 (없으면 None)"""
+    with _lock:
+        entry = _pending.get(user_id)
+        if entry is None:
+            return None
+        return {"login_count": entry[0], "last_login_at": entry[1], "last_seen_at": entry[2]}
+
+
+def activity_stats():
+    with _lock:
+        size = len(_pending)
+        oldest = min((entry[3] for entry in _pending.values()), default=None)
+    return {
+        "enabled": ACTIVITY_ENABLED,
+        "pending": size,
+        # 가장 오래 기다린 기록이 버퍼에 머문 시간 (flush가 밀리면 커짐)
+        "lag_seconds": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+        **_stats,
+    }
@@ -0,0 +1,77 @@
+# DataLoader: 요청 하나 안에서 흩어진 id 조회를 모아서 한 번에 처리
+# 같은 이벤트 루프 차례(tick)에 들어온 load(id)들을 모아 batch_fn(id 목록) 한 번으로 조회하고,
+# 같은 id는 한 번만 조회한다 (요청이 끝날 때까지 결과를 기억).
+#
+# 사용 예)
+#   loader = user_loader(request)
+#   author = await loader.load(post['author_id'])                 # 여러 곳에서 따로 불러도
+#   authors = await loader.load_many([1, 2, 3])                   # 실제 DB 조회는 묶어서 한 번
+#
+# 요청마다 새로 만들어 쓴다 (request.state에 보관). 요청 사이에 공유하는 캐시는 user_cache가 담당.
+import asyncio
+
+from app.core.db import can_use_replica
+from app.services import user_cache
+
+
+class DataLoader:
+    """
+    batch_fn: async 함수. 키 목록을 받아 {키: 값} dict를 반환 (없는 키는 빠져도 됨 -> None)
+    max_batch_size: 한 번에 batch_fn에 넘길 최대 키 수 (None이면 제한 없음)
+    """
+
+    def __init__(self, batch_fn, max_batch_size=None):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._futures = {}   # 키 -> Future (이번 요청에서 이미 요청한 키)
+        self._queue = []     # 아직 batch_fn에 넘기지 않은 키
+        self._batches = 0
+
+    async def load(self, key):
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # 지금 차례에 실행 중인 다른 load()들이 모두 큐에 들어온 뒤에 한 번에 조회
+                loop.call_soon(self._dispatch)
+        return await future
+
+    async def load_many(self, keys):
+        """키 목록 순서대로 값 목록 (없는 키는 None)"""
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _dispatch(self):
+        keys, self._queue = self._queue, []
+        size = self.max_batch_size or len(keys)
+        for start in range(0, len(keys), size):
+            asyncio.ensure_future(self._run(keys[start:start + size]))
+
+    async def _run(self, keys):
+        self._batches += 1
+        try:
+            values = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(values.get(key))
+
+    def stats(self):
+        return {"keys": len(self._futures), "batches": self._batches}
+
+
+def user_loader(request):
+    """요청별 회원 DataLoader (캐시에 없는 회원만 WHERE id IN (...)으로 묶어서 조회)"""
+    loader = getattr(request.state, "user_loader", None)
+    if loader is None:
+        readonly = can_use_replica(request.session)
+        loader = DataLoader(lambda ids: user_cache.get_users(ids, readonly=readonly))
+        request.state.user_loader = loader
+    return loader
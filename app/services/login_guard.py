@@ -0,0 +1,119 @@
+# 로그인 시도 제한 (무차별 대입/credential stuffing 방어)
+# bcrypt 검증은 한 번에 수백 ms의 CPU를 쓰므로, 공격 트래픽이 몰리면 정상 사용자까지 느려진다.
+# DB 조회나 bcrypt 전에 아래 순서로 걸러낸다.
+#   1) IP별 토큰 버킷          (LOGIN_IP_BURST개까지 몰아서, 1분에 LOGIN_IP_PER_MINUTE번)
+#   2) 이메일별 토큰 버킷       (LOGIN_EMAIL_BURST개까지 몰아서, 1분에 LOGIN_EMAIL_PER_MINUTE번)
+#   3) (이메일, IP)별 실패 횟수 (LOGIN_FAILURE_WINDOW초 동안 LOGIN_MAX_FAILURES번 실패하면 그 IP에서만 잠시 잠금)
+#      이메일만으로 잠그면 아무나 남의 계정에 틀린 비밀번호를 보내서 잠가 버릴 수 있으므로 IP를 함께 키로 쓴다.
+#      여러 IP에서 한 계정을 노리는 공격은 2)의 이메일별 토큰 버킷이 속도를 제한한다.
+# email 인자는 라우터에서 검증하고 소문자로 정규화한 값을 넘긴다.
+# 또 같은 계정에 같은 틀린 비밀번호를 반복해서 보내면 bcrypt를 다시 돌리지 않고 최근 실패 결과를 재사용한다.
+# (없는 이메일도 똑같이 재사용해서, 응답시간으로 가입 여부가 드러나지 않게 한다)
+import hashlib
+import hmac
+import os
+import secrets
+
+from app.core.cache import TTLCache
+from app.core.ratelimit import (RATE_LIMIT_ENABLED, SlidingWindowCounter, TokenBucketLimiter,
+                                get_rate_limit_backend)
+
+LOGIN_IP_BURST = int(os.getenv('LOGIN_IP_BURST', '20'))
+LOGIN_IP_PER_MINUTE = float(os.getenv('LOGIN_IP_PER_MINUTE', '60'))
+LOGIN_EMAIL_BURST = int(os.getenv('LOGIN_EMAIL_BURST', '5'))
+LOGIN_EMAIL_PER_MINUTE = float(os.getenv('LOGIN_EMAIL_PER_MINUTE', '10'))
+LOGIN_MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', '10'))
+LOGIN_FAILURE_WINDOW = int(os.getenv('LOGIN_FAILURE_WINDOW', '900'))
+# X-Forwarded-For 를 믿을지 여부 (nginx 등 프록시 뒤에서 실행할 때만 1)
+TRUST_PROXY_HEADERS = os.getenv('TRUST_PROXY_HEADERS', '0') == '1'
+
+_backend = get_rate_limit_backend()
+_ip_limiter = TokenBucketLimiter("login:ip", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE, _backend)
+_email_limiter = TokenBucketLimiter("login:email", LOGIN_EMAIL_BURST, LOGIN_EMAIL_PER_MINUTE, _backend)
+_failures = SlidingWindowCounter("login:fail", LOGIN_MAX_FAILURES, LOGIN_FAILURE_WINDOW, _backend)
+
+# 최근 실패한 (이메일, 저장된 해시, 비밀번호) 조합. 비밀번호 원문 대신 프로세스마다 다른 키로 만든 HMAC만 보관
+_failed_attempts = TTLCache(maxsize=10000, ttl=300)
+_attempt_key = secrets.token_bytes(32)
+
+_stats = {
+    "rejected_ip": 0,
+    "rejected_email": 0,
+    "locked_out": 0,
+    "failures": 0,
+    "successes": 0,
+    "dummy_verifications": 0,
+    "failure_cache_hits": 0,
+}
+
+
+def client_ip(request):
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def check(ip, email):
+    """
+    로그인 시도를 허용할지 판단. 허용이면 None,
+    거부면 (사유 메시지, Retry-After 초) 반환
+    """
+    if not RATE_LIMIT_ENABLED:
+        return None
+    retry_after = await _ip_limiter.take(ip)
+    if retry_after:
+        _stats["rejected_ip"] += 1
+        return "로그인 시도가 너무 많습니다. 잠시 후 다시 시도하세요.", retry_after
+    retry_after = await _email_limiter.take(email)
+    if retry_after:
+        _stats["rejected_email"] += 1
+        return "로그인 시도가 너무 많습니다. 잠시 후 다시 시도하세요.", retry_after
+    if await _failures.exceeded(_failure_key(email, ip)):
+        _stats["locked_out"] += 1
+        return "로그인 실패가 반복되어 잠시 잠겼습니다. 잠시 후 다시 시도하세요.", LOGIN_FAILURE_WINDOW
+    return None
+
+
+def _failure_key(email, ip):
+    return f"{email}|{ip}"
+
+
+def _attempt(email, hashed, password):
+    # 비밀번호가 바뀌면(해시가 달라지면) 예전 실패 기록은 자동으로 무효
+    message = f"{email}\0{hashed or ''}\0{password}"
+    return hmac.new(_attempt_key, message.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def is_known_failure(email, hashed, password):
+    """최근에 이미 틀린 것으로 확인된 비밀번호면 True (bcrypt 생략). 없는 사용자는 hashed=None"""
+    if _failed_attempts.get(_attempt(email, hashed, password)):
+        _stats["failure_cache_hits"] += 1
+        return True
+    return False
+
+
+async def record_failure(ip, email, hashed, password):
+    _stats["failures"] += 1
+    _failed_attempts.set(_attempt(email, hashed, password), True)
+    if RATE_LIMIT_ENABLED:
+        await _failures.hit(_failure_key(email, ip))
+
+
+async def record_success(ip, email):
+    _stats["successes"] += 1
+    if RATE_LIMIT_ENABLED:
+        await _failures.reset(_failure_key(email, ip))
+
+
+def record_dummy_verification():
+    _stats["dummy_verifications"] += 1
+
+
+def guard_stats():
+    return {
+        "enabled": RATE_LIMIT_ENABLED,
+        "backend": type(_backend).__name__,
+        **_stats,
+    }
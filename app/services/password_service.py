@@ -0,0 +1,138 @@
+# 비밀번호 해싱/검증 서비스
+# bcrypt는 한 번에 100~300ms의 CPU를 쓰기 때문에 요청 스레드풀이나 이벤트 루프에서 직접 돌리면
+# 로그인이 몰릴 때 다른 API까지 모두 느려진다. 별도의 프로세스 풀에서 실행하고 동시 실행 수를 제한한다.
+import asyncio
+import multiprocessing
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+from app.core import metrics
+
+# 설정 (환경변수)
+# BCRYPT_ROUNDS: 해시 cost factor. 바꾸면 다음 로그인 때 자동으로 새 cost로 재해싱됨
+# PASSWORD_HASH_WORKERS: 해싱 전용 프로세스 수 (0이면 프로세스 대신 스레드 사용)
+# PASSWORD_HASH_CONCURRENCY: 동시에 실행할 해싱 작업 수 (초과분은 대기열에서 기다림)
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_CONCURRENCY = int(os.getenv('PASSWORD_HASH_CONCURRENCY', str(max(1, PASSWORD_HASH_WORKERS) * 2)))
+
+_executor = None
+_dummy_hash = None
+_semaphore = asyncio.Semaphore(PASSWORD_HASH_CONCURRENCY)
+_stats = {
+    "waiting": 0,      # 대기열 길이 (세마포어를 기다리는 작업 수)
+    "in_flight": 0,    # 실행 중인 작업 수
+    "completed_total": 0,
+    "rehashed_total": 0,
+    "wait_seconds_max": 0.0,
+    "run_seconds_total": 0.0,
+}
+
+
+# 프로세스 풀에서 실행되는 함수는 pickle 가능해야 하므로 모듈 최상위에 둔다.
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _checkpw(password, hashed):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        if PASSWORD_HASH_WORKERS > 0:
+            # fork는 이벤트 루프/스레드가 떠 있는 상태를 복제하므로 spawn 사용
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_CONCURRENCY,
+                                           thread_name_prefix='password-hash')
+    return _executor
+
+
+async def _run(func, *args):
+    start = time.monotonic()
+    _stats["waiting"] += 1
+    try:
+        await _semaphore.acquire()
+    finally:
+        _stats["waiting"] -= 1
+    _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], time.monotonic() - start)
+    _stats["in_flight"] += 1
+    run_start = time.monotonic()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _stats["in_flight"] -= 1
+        _stats["completed_total"] += 1
+        elapsed = time.monotonic() - run_start
+        _stats["run_seconds_total"] += elapsed
+        metrics.record_password_hash(elapsed)
+        _semaphore.release()
+
+
+async def hash_password(password):
+    """비밀번호를 bcrypt로 해싱해서 문자열로 반환"""
+    return await _run(_hashpw, password, BCRYPT_ROUNDS)
+
+
+async def verify_password(password, hashed):
+    """입력한 비밀번호와 저장된 해시 비교"""
+    return await _run(_checkpw, password, hashed)
+
+
+async def verify_dummy(password):
+    """
+    없는 사용자의 로그인 시도에도 실제 사용자와 같은 bcrypt 검증을 한 번 수행하고 False 반환
+    (없는 이메일만 빨리 실패하면 응답시간으로 가입 여부를 알아낼 수 있기 때문)
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password(secrets.token_urlsafe(16))
+    await verify_password(password, _dummy_hash)
+    return False
+
+
+def needs_rehash(hashed):
+    """저장된 해시의 cost factor가 현재 설정(BCRYPT_ROUNDS)과 다르면 True"""
+    try:
+        # 형식: $2b$12$<salt+hash>
+        return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def record_rehash():
+    _stats["rehashed_total"] += 1
+
+
+def hasher_stats():
+    completed = _stats["completed_total"]
+    return {
+        "executor": "process" if PASSWORD_HASH_WORKERS > 0 else "thread",
+        "workers": PASSWORD_HASH_WORKERS,
+        "concurrency": PASSWORD_HASH_CONCURRENCY,
+        "rounds": BCRYPT_ROUNDS,
+        "waiting": _stats["waiting"],
+        "in_flight": _stats["in_flight"],
+        "completed_total": completed,
+        "rehashed_total": _stats["rehashed_total"],
+        "wait_seconds_max": round(_stats["wait_seconds_max"], 6),
+        "run_seconds_avg": round(_stats["run_seconds_total"] / completed, 6) if completed else 0.0,
+    }
+
+
+def shutdown():
+    """서버 종료 시 해싱 프로세스 정리"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,182 @@
+# 회원 정보 read-through 캐시
+# /users/me, /users/{user_id}, 로그인 조회가 매번 MySQL을 치지 않도록 캐시에서 먼저 찾고,
+# 없을 때만 DB에서 읽어서 캐시에 넣는다. 회원 정보가 바뀌는 API에서는 invalidate_user()로 지운다.
+#
+# 1차: 프로세스 내 TTL+LRU 캐시 (USER_CACHE_SIZE, USER_CACHE_TTL)
+# 2차: 공유 캐시 백엔드 (CACHE_BACKEND 설정 시, 워커 여러 개일 때 사용)
+#   - 로그인용 캐시(비밀번호 해시 포함)는 공유 백엔드에 올리지 않고 1차 캐시에만 둔다.
+# 버전 맵: 회원 id -> users.version. 조건부 GET(If-None-Match)을 DB/캐시 조회 없이 판단할 때 사용
+# 주의) invalidate_user()는 자기 프로세스의 1차 캐시만 지울 수 있다. 워커가 여러 개면 다른 워커에 옛 비밀번호 해시,
+#   삭제된 회원, 옛 버전이 남으므로 USER_CACHE_LOCAL=0 으로 1차 캐시/로그인 캐시/버전 맵을 모두 끈다
+#   (app.launcher가 워커 2개 이상이면 자동으로 설정). 이때 회원 정보는 공유 백엔드(있으면)와 DB에서만 읽는다.
+# 캐시에 없는 회원을 여러 요청이 동시에 찾으면 DB 조회는 한 번만 하고 결과를 나눠 쓴다 (single-flight)
+# 복제본(MYSQL_REPLICA_HOSTS)에서 읽을 때: 최근에 바뀐 회원은 복제가 따라오기 전의 옛 값이 캐시에 들어가지 않도록 원본에서 읽는다.
+import os
+
+from app.core.cache import TTLCache, get_shared_backend
+from app.core.db import DB_READ_YOUR_WRITES_SECONDS, get_async_connection
+from app.core.singleflight import SingleFlight
+from app.crud import user as crud_user
+
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '60'))
+# 여러 회원을 조회할 때 WHERE id IN (...) 한 번에 넣는 최대 id 수
+USER_BATCH_CHUNK = int(os.getenv('USER_BATCH_CHUNK', '500'))
+# 프로세스 내 캐시 사용 여부 (워커가 하나일 때만 켤 것)
+USER_CACHE_LOCAL = os.getenv('USER_CACHE_LOCAL', '1') == '1'
+
+_users = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)   # "id:<id>" -> 회원 정보
+_logins = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)  # "email:<email>" -> 로그인 정보
+_versions = TTLCache(maxsize=USER_CACHE_SIZE * 10, ttl=USER_CACHE_TTL)  # 회원 id -> version
+# 최근에 바뀐 회원 id (복제 지연 동안은 복제본에서 읽지 않음)
+_recent_writes = TTLCache(maxsize=USER_CACHE_SIZE, ttl=DB_READ_YOUR_WRITES_SECONDS)
+# 동시에 들어온 같은 DB 조회를 하나로 합침
+_user_loads = SingleFlight("user")
+_login_loads = SingleFlight("login")
+_stats = {"shared_hits": 0, "shared_misses": 0, "invalidations": 0}
+
+
+def _id_key(user_id):
+    return f"user:id:{user_id}"
+
+
+def _email_key(email):
+    return f"user:email:{email.lower()}"
+
+
+async def get_user(user_id, readonly=False):
+    """
+    회원 정보(id, name, email, created_at) 조회. 없으면 None
+    readonly=True 이면 캐시에 없을 때 복제본에서 읽는다 (최근에 바뀐 회원은 원본에서)
+    """
+    key = _id_key(user_id)
+    if USER_CACHE_LOCAL:
+        user = _users.get(key)
+        if user is not None:
+            return user
+
+    shared = get_shared_backend()
+    if shared is not None:
+        user = await shared.get(key)
+        if user is not None:
+            _stats["shared_hits"] += 1
+            _remember_user(user)
+            return user
+        _stats["shared_misses"] += 1
+
+    readonly = readonly and _recent_writes.get(user_id) is None
+    # 원본/복제본 조회는 따로 합친다 (방금 수정한 세션이 복제본 조회 결과를 받지 않도록)
+    return await _user_loads.do((user_id, readonly), lambda: _load_user(user_id, readonly))
+
+
+async def _load_user(user_id, readonly):
+    async with get_async_connection(readonly=readonly) as conn:
+        user = await crud_user.get_user(conn, user_id)
+    if user is not None:
+        _remember_user(user)
+        shared = get_shared_backend()
+        if shared is not None:
+            await shared.set(_id_key(user_id), user, USER_CACHE_TTL)
+    return user
+
+
+async def get_users(user_ids, readonly=False):
+    """
+    여러 회원 정보를 한 번에 조회해서 {id: 회원 정보}로 반환 (없는 id는 빠짐)
+    캐시에 없는 회원만 WHERE id IN (...) 쿼리로 읽는다 (USER_BATCH_CHUNK개씩 나눠서, 커넥션은 하나)
+    """
+    found = {}
+    missing = []
+    for user_id in dict.fromkeys(user_ids):
+        user = _users.get(_id_key(user_id)) if USER_CACHE_LOCAL else None
+        if user is not None:
+            found[user_id] = user
+        else:
+            missing.append(user_id)
+    if not missing:
+        return found
+    readonly = readonly and not any(_recent_writes.get(user_id) is not None for user_id in missing)
+    rows = []
+    async with get_async_connection(readonly=readonly) as conn:
+        for start in range(0, len(missing), USER_BATCH_CHUNK):
+            rows.extend(await crud_user.get_users_by_ids(conn, missing[start:start + USER_BATCH_CHUNK]))
+    for user in rows:
+        _remember_user(user)
+        found[user['id']] = user
+    return found
+
+
+def _remember_user(user):
+    """1차 캐시와 버전 맵에 저장 (USER_CACHE_LOCAL=0 이면 저장하지 않음)"""
+    if not USER_CACHE_LOCAL:
+        return
+    _users.set(_id_key(user['id']), user)
+    if user.get('version') is not None:
+        _versions.set(user['id'], user['version'])
+
+
+def get_version(user_id):
+    """버전 맵에 있는 회원 정보 버전 (모르면 None -> DB/캐시에서 읽어야 함)"""
+    return _versions.get(user_id)
+
+
+async def get_user_for_login(email):
+    """로그인용 회원 정보(id, name, email, password) 조회. 없으면 None"""
+    # 공유 백엔드를 쓰거나 USER_CACHE_LOCAL=0 이면 매번 DB에서 읽는다 (다른 워커가 바꾼 비밀번호/탈퇴를 바로 반영)
+    use_cache = USER_CACHE_LOCAL and get_shared_backend() is None
+    key = _email_key(email)
+    if use_cache:
+        user = _logins.get(key)
+        if user is not None:
+            return user
+    user = await _login_loads.do(key, lambda: _load_login(email))
+    if user is not None and use_cache:
+        _logins.set(key, user)
+    return user
+
+
+async def _load_login(email):
+    async with get_async_connection() as conn:
+        return await crud_user.get_user_with_password_by_email(conn, email)
+
+
+def is_email_registered(email):
+    """
+    캐시만 보고 이미 가입된 이메일인지 판단
+    True면 확실히 가입된 이메일, False면 '모름' (DB 확인 필요)
+    """
+    return _logins.get(_email_key(email)) is not None
+
+
+async def invalidate_user(user_id=None, *emails):
+    """회원 정보가 바뀌었을 때 캐시에서 제거 (id와 관련 이메일들)"""
+    keys = []
+    if user_id is not None:
+        keys.append(_id_key(user_id))
+    keys.extend(_email_key(email) for email in emails if email)
+    for key in keys:
+        _users.delete(key)
+        _logins.delete(key)
+        # 바뀌기 전에 시작한 조회 결과를 이후 요청이 받지 않도록
+        _login_loads.forget(key)
+    if user_id is not None:
+        _versions.delete(user_id)
+        _recent_writes.set(user_id, True)
+        _user_loads.forget((user_id, False))
+        _user_loads.forget((user_id, True))
+    shared = get_shared_backend()
+    if shared is not None and keys:
+        await shared.delete(*keys)
+    _stats["invalidations"] += 1
+
+
+def cache_stats():
+    return {
+        "users": _users.stats(),
+        "logins": _logins.stats(),
+        "versions": _versions.stats(),
+        "singleflight": {"user": _user_loads.stats(), "login": _login_loads.stats()},
+        "local": USER_CACHE_LOCAL,
+        "shared_backend": type(get_shared_backend()).__name__ if get_shared_backend() else None,
+        **_stats,
+    }
@@ -0,0 +1,166 @@
+# 회원 대량 가입(import) 서비스
+# 요청 본문(NDJSON 또는 CSV)을 스트리밍으로 한 줄씩 읽어서 BULK_CHUNK_SIZE 단위로
+# 검증(UserCreate) -> 비밀번호 병렬 해싱 -> executemany로 한 번에 INSERT (묶음마다 트랜잭션 1개) 한다.
+import asyncio
+import codecs
+import csv
+import json
+import os
+from datetime import datetime
+
+from pydantic import ValidationError
+
+from app.core.db import get_async_connection, is_duplicate_key_error
+from app.crud import user as crud_user
+from app.schemas.user import UserCreate
+from app.services import password_service, user_cache
+
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '500'))
+# 요청 하나로 가입시킬 수 있는 최대 줄 수 (줄마다 bcrypt 1번 + 결과 1개가 메모리에 쌓이므로)
+USER_IMPORT_MAX_ROWS = int(os.getenv('USER_IMPORT_MAX_ROWS', '10000'))
+DUPLICATE_EMAIL = "이미 등록된 이메일입니다."
+
+
+class TooManyRows(Exception):
+    """본문의 줄 수가 USER_IMPORT_MAX_ROWS를 넘음 (created: 그 전까지 가입된 수)"""
+
+    def __init__(self, created):
+        super().__init__(f"한 번에 최대 {USER_IMPORT_MAX_ROWS}줄까지 가입할 수 있습니다.")
+        self.created = created
+
+
+async def iter_lines(stream):
+    """바이트 스트림을 받아서 줄 단위 문자열로 돌려주는 async generator (요청 전체를 메모리에 올리지 않음)"""
+    # utf-8-sig: 엑셀(Windows)이 저장한 CSV 앞의 BOM을 버림 (없으면 utf-8과 같음)
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    async for chunk in stream:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            yield line.rstrip('\r')
+    buffer += decoder.decode(b'', final=True)
+    if buffer.strip():
+        yield buffer.rstrip('\r')
+
+
+async def iter_records(stream, fmt):
+    """
+    (줄 번호, dict 또는 에러 메시지) 를 차례로 돌려준다.
+    fmt: "ndjson" (한 줄에 JSON 객체 하나) 또는 "csv" (첫 줄은 name,email,password 헤더)
+    """
+    header = None
+    line_no = 0
+    async for line in iter_lines(stream):
+        line_no += 1
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            yield line_no, dict(zip(header, values))
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_no, "JSON 형식이 올바르지 않습니다."
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "JSON 객체가 아닙니다."
+                continue
+            yield line_no, record
+
+
+async def import_users(stream, fmt):
+    """
+    대량 가입 처리 후 줄별 결과 목록 반환 [{"line": 1, "status": "created", "id": 10}, ...]
+    USER_IMPORT_MAX_ROWS줄을 넘으면 남은 줄은 처리하지 않고 TooManyRows (이미 처리한 묶음은 가입된 상태)
+    """
+    results = []
+    chunk = []
+    count = 0
+    async for line_no, record in iter_records(stream, fmt):
+        count += 1
+        if count > USER_IMPORT_MAX_ROWS:
+            raise TooManyRows(sum(1 for result in results if result["status"] == "created"))
+        chunk.append((line_no, record))
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            results.extend(await _import_chunk(chunk))
+            chunk = []
+    if chunk:
+        results.extend(await _import_chunk(chunk))
+    return results
+
+
+async def _import_chunk(chunk):
+    results = {}
+    valid = []  # (line_no, UserCreate)
+    seen = set()
+    for line_no, record in chunk:
+        if isinstance(record, str):
+            results[line_no] = {"line": line_no, "status": "error", "detail": record}
+            continue
+        try:
+            user = UserCreate.model_validate(record)
+        except ValidationError as e:
+            results[line_no] = {"line": line_no, "status": "error",
+                                "detail": e.errors(include_url=False, include_context=False, include_input=False)}
+            continue
+        email = user.email.lower()
+        if email in seen:
+            results[line_no] = {"line": line_no, "status": "error", "detail": DUPLICATE_EMAIL}
+            continue
+        seen.add(email)
+        valid.append((line_no, user))
+
+    if valid:
+        # 이미 가입된 이메일은 해싱하기 전에 걸러낸다 (IN 쿼리 1번)
+        async with get_async_connection() as conn:
+            existing = await crud_user.find_existing_emails(conn, [user.email for _, user in valid])
+        pending = []
+        for line_no, user in valid:
+            if user.email.lower() in existing:
+                results[line_no] = {"line": line_no, "status": "error", "detail": DUPLICATE_EMAIL}
+            else:
+                pending.append((line_no, user))
+
+        # 비밀번호 해싱은 password_service 프로세스 풀에서 병렬로
+        hashes = await asyncio.gather(*[password_service.hash_password(user.password) for _, user in pending])
+        now = datetime.now()
+        rows = [(user.name, user.email, hashed, now) for (_, user), hashed in zip(pending, hashes)]
+        if rows:
+            for line_no, result in await _insert_rows(pending, rows):
+                results[line_no] = result
+    return [results[line_no] for line_no, _ in chunk if line_no in results]
+
+
+async def _insert_rows(pending, rows):
+    try:
+        async with get_async_connection() as conn:
+            ids = await crud_user.insert_users(conn, rows)
+            await conn.commit()
+        created = [(line_no, {"line": line_no, "status": "created", "id": ids.get(user.email.lower())})
+                   for line_no, user in pending]
+        await user_cache.invalidate_user(None, *[user.email for _, user in pending])
+        return created
+    except Exception as e:
+        if not is_duplicate_key_error(e):
+            return [(line_no, {"line": line_no, "status": "error", "detail": f"DB Error: {str(e)}"})
+                    for line_no, _ in pending]
+
+    # 중복 확인 후 그 사이에 다른 요청이 같은 이메일로 가입한 경우: 이 묶음만 한 줄씩 다시 시도
+    results = []
+    async with get_async_connection() as conn:
+        for (line_no, user), row in zip(pending, rows):
+            try:
+                user_id = await crud_user.insert_user(conn, *row)
+                await conn.commit()
+                results.append((line_no, {"line": line_no, "status": "created", "id": user_id}))
+            except Exception as e:
+                await conn.rollback()
+                detail = DUPLICATE_EMAIL if is_duplicate_key_error(e) else f"DB Error: {str(e)}"
+                results.append((line_no, {"line": line_no, "status": "error", "detail": detail}))
+    await user_cache.invalidate_user(None, *[user.email for _, user in pending])
+    return results
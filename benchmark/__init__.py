@@ -0,0 +1,10 @@
+# 회원/로그인 API 부하 측정(벤치마크) 패키지
+#
+# 실행 방법)
+#   python -m benchmark run --db sqlite --concurrency 20 --duration 20 --out before.json
+#   python -m benchmark run --db mysql  --concurrency 50 --duration 30 --out after.json
+#   python -m benchmark compare before.json after.json
+#
+# --db mysql : .env 의 MYSQL_* 접속 정보로 실제 MySQL(호환 서버)에 붙어서 측정
+# --db sqlite: MySQL 없이 SQLite 파일 DB를 aiomysql 풀처럼 보이게 끼워서 측정 (sqlite_shim.py)
+# --base-url : 이미 떠 있는 서버(예: 운영과 같은 설정의 uvicorn 워커 여러 개)를 측정
@@ -0,0 +1,185 @@
+# python -m benchmark run ...      : 서버를 띄우고(또는 --base-url 서버에) 부하를 걸어 결과 출력/저장
+# python -m benchmark compare A B  : 두 결과(JSON)를 비교 (예: 변경 전/후 커밋)
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from benchmark.runner import DEFAULT_MIX, parse_mix, run_load
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(db, workdir):
+    """app.main:app 을 같은 프로세스의 별도 스레드에서 uvicorn으로 실행하고 (server, thread, base_url) 반환"""
+    # 앱 설정은 import 시점에 환경변수에서 읽으므로 import 전에 정한다
+    os.environ.setdefault("SESSION_BACKEND", "memory")
+    # 가상 사용자 전부가 127.0.0.1 한 곳에서 로그인하므로 로그인 시도 제한은 기본으로 끈다
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    if db == "sqlite":
+        os.environ["DB_AUTO_MIGRATE"] = "0"  # 스키마는 sqlite_shim이 만든다
+
+    import uvicorn
+    from app.main import app
+
+    if db == "sqlite":
+        from benchmark import sqlite_shim
+        sqlite_shim.install(os.path.join(workdir, "bench.sqlite3"))
+    else:
+        from app.core.schema import ensure_schema
+        ensure_schema()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port,
+                                           log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("서버 시작 실패")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def _cleanup_mysql(run_id):
+    """MySQL에 만든 측정용 계정 삭제"""
+    from app.core.db import get_connection
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM users WHERE email LIKE %s", (f"bench-{run_id}-%",))
+            deleted = cursor.rowcount
+        conn.commit()
+        return deleted
+    finally:
+        conn.close()
+
+
+def cmd_run(args):
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    server = thread = None
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.base_url:
+            base_url = args.base_url
+        else:
+            server, thread, base_url = _start_server(args.db, workdir)
+        try:
+            result = asyncio.run(run_load(
+                base_url, concurrency=args.concurrency, duration=args.duration, warmup=args.warmup,
+                accounts=args.accounts, mix=mix, seed=args.seed,
+            ))
+        finally:
+            if server is not None:
+                server.should_exit = True
+                thread.join(timeout=10)
+
+    if server is not None and args.db == "mysql" and not args.keep_data:
+        _cleanup_mysql(result["run_id"])
+
+    result["meta"] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "db": "external" if args.base_url else args.db,
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "mix": mix,
+        "bcrypt_rounds": os.getenv("BCRYPT_ROUNDS", "12"),
+    }
+    print_result(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.out}")
+
+
+def print_result(result):
+    meta = result.get("meta", {})
+    print(f"커밋 {meta.get('git_commit')} / DB {meta.get('db')} / 동시 사용자 {meta.get('concurrency')}"
+          f" / {result['elapsed_seconds']}초")
+    print(f"{'작업':<8}{'요청수':>8}{'에러':>6}{'RPS':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    rows = list(result["endpoints"].items()) + [("total", result["total"])]
+    for name, s in rows:
+        print(f"{name:<8}{s['count']:>8}{s['errors']:>6}{s['rps']:>10.1f}"
+              f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}")
+
+
+def _change(old, new):
+    if not old:
+        return "   -"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def cmd_compare(args):
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{before.get('meta', {}).get('git_commit')} -> {after.get('meta', {}).get('git_commit')}")
+    print(f"{'작업':<8}{'RPS':>22}{'p50(ms)':>22}{'p95(ms)':>22}{'p99(ms)':>22}")
+    names = sorted(set(before["endpoints"]) | set(after["endpoints"])) + ["total"]
+    for name in names:
+        old = before["total"] if name == "total" else before["endpoints"].get(name)
+        new = after["total"] if name == "total" else after["endpoints"].get(name)
+        if old is None or new is None:
+            continue
+        cells = [f"{old[key]:.1f}->{new[key]:.1f} {_change(old[key], new[key])}"
+                 for key in ("rps", "p50_ms", "p95_ms", "p99_ms")]
+        print(f"{name:<8}" + "".join(f"{cell:>22}" for cell in cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="회원/로그인 API 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="부하를 걸어 응답시간/RPS 측정")
+    run.add_argument("--db", choices=["mysql", "sqlite"], default="mysql",
+                     help="mysql: .env의 MYSQL_* 서버 사용, sqlite: SQLite 대용 DB")
+    run.add_argument("--base-url", help="이미 실행 중인 서버 주소 (지정하면 서버를 직접 띄우지 않음)")
+    run.add_argument("--concurrency", "-c", type=int, default=10, help="동시 가상 사용자 수")
+    run.add_argument("--duration", "-d", type=float, default=10.0, help="측정 시간(초)")
+    run.add_argument("--warmup", type=float, default=2.0, help="측정 전 예열 시간(초)")
+    run.add_argument("--accounts", type=int, help="미리 만들 계정 수 (기본: 동시 사용자 수)")
+    run.add_argument("--mix", help="작업 비율 (기본: login=1,list=4,me=4,create=1,update=1)")
+    run.add_argument("--seed", type=int, default=0, help="작업 선택 난수 시드")
+    run.add_argument("--out", "-o", help="결과 JSON 저장 경로")
+    run.add_argument("--keep-data", action="store_true", help="MySQL에 만든 측정용 계정을 지우지 않음")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="두 결과 JSON 비교")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+# 비밀번호 해싱 프로세스 풀(spawn)이 이 모듈을 다시 import 하므로 반드시 main 가드 안에서 실행
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# 빠른 JSON 경로(app/core/fastjson.py)가 기존 응답(response_model=UserOut 검증 + Pydantic 직렬화)과
+# 바이트 단위로 같은 결과를 내는지 확인하는 스크립트 (예제 행 확인은 tests/test_json_parity.py 에서 pytest로도 실행)
+#
+# 실행 방법)
+#   python -m benchmark.json_parity              # 준비된 예제 행(한글, 이모지, 제어문자, 마이크로초 유무 등)으로 확인
+#   python -m benchmark.json_parity --from-db    # 실제 DB(users 테이블)의 행으로 확인
+#   python -m benchmark.json_parity --bench      # 두 경로의 직렬화 시간 비교
+# 다르면 첫 번째 차이를 출력하고 종료 코드 1로 끝난다.
+import argparse
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.core import fastjson
+from app.core.fastjson import RowSerializer
+from app.schemas.user import UserOut
+
+# FastAPI가 response_model=List[UserOut] / UserOut 으로 응답을 만들 때와 같은 방식
+_list_adapter = TypeAdapter(List[UserOut])
+_item_adapter = TypeAdapter(UserOut)
+
+
+def expected_many(rows):
+    return _list_adapter.dump_json(_list_adapter.validate_python(rows), by_alias=True)
+
+
+def expected_one(row):
+    return _item_adapter.dump_json(_item_adapter.validate_python(row), by_alias=True)
+
+
+def sample_rows():
+    names = [
+        "홍길동", "plain ascii", "emoji 😀🚀", 'quote " and \\ backslash', "tab\tnew\nline\r",
+        "control \x01\x1f\x7f", "</script><b>html</b>", "line sep \u2028 \u2029", "", "decomposed e\u0301",
+    ]
+    created = [
+        datetime(2026, 1, 2, 3, 4, 5),
+        datetime(2026, 1, 2, 3, 4, 5, 10),
+        datetime(2026, 12, 31, 23, 59, 59, 999999),
+        datetime(1970, 1, 1),
+    ]
+    rows = []
+    for i, name in enumerate(names):
+        rows.append({
+            "id": i + 1,
+            "name": name,
+            "email": f"user{i}@example.com",
+            "created_at": created[i % len(created)],
+            # DB 행에는 모델에 없는 컬럼도 있을 수 있음 (응답에서 빠져야 함)
+            "password": "$2b$12$should-not-appear",
+        })
+    rows.append({"id": 2 ** 31 - 1, "name": "max int", "email": "max@example.co.kr",
+                 "created_at": datetime(2026, 6, 1, 12, 0, 0, 500000)})
+    # 공유 캐시(CACHE_BACKEND)를 거친 행은 created_at이 ISO 문자열
+    rows.append({"id": 99, "name": "from shared cache", "email": "cache@example.com",
+                 "created_at": "2026-10-18T19:27:07.934656"})
+    return rows
+
+
+def db_rows(limit):
+    from app.core.db import get_connection
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id, name, email, created_at FROM users ORDER BY id LIMIT %s", (limit,))
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def check(rows, serializer, label):
+    """차이가 있으면 첫 번째 차이를 출력하고 False"""
+    ok = True
+    got, want = serializer.dumps_many(rows), expected_many(rows)
+    if got != want:
+        print(f"[{label}] 목록 응답이 다릅니다.\n  fast:     {got[:300]!r}\n  expected: {want[:300]!r}")
+        ok = False
+    for row in rows:
+        got, want = serializer.dumps(row), expected_one(row)
+        if got != want:
+            print(f"[{label}] id={row.get('id')} 행이 다릅니다.\n  fast:     {got!r}\n  expected: {want!r}")
+            return False
+    return ok
+
+
+def bench(rows, serializer, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        expected_many(rows)
+    validated = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serializer.dumps_many(rows)
+    fast = (time.perf_counter() - start) / repeat
+    print(f"{len(rows)}행: 검증+직렬화 {validated * 1000:.2f}ms, 빠른 경로 {fast * 1000:.2f}ms "
+          f"({validated / fast:.1f}배)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark.json_parity")
+    parser.add_argument("--from-db", action="store_true", help="실제 DB의 users 행으로 확인")
+    parser.add_argument("--limit", type=int, default=10000, help="--from-db 에서 읽을 최대 행 수")
+    parser.add_argument("--bench", action="store_true", help="직렬화 시간 비교")
+    args = parser.parse_args(argv)
+
+    rows = db_rows(args.limit) if args.from_db else sample_rows()
+    serializer = RowSerializer(UserOut)
+
+    ok = True
+    if fastjson.orjson is not None:
+        ok = check(rows, serializer, "orjson") and ok
+    else:
+        print("orjson이 설치되어 있지 않아 Pydantic 대체 경로만 확인합니다.")
+    # orjson이 없을 때 쓰는 대체 경로도 확인
+    saved, fastjson.orjson = fastjson.orjson, None
+    try:
+        ok = check(rows, serializer, "fallback") and ok
+    finally:
+        fastjson.orjson = saved
+
+    if args.bench:
+        bench((rows * (10000 // max(1, len(rows)) + 1))[:10000], serializer)
+    print("일치" if ok else "불일치")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# 부하 생성기: 가상 사용자(virtual user) N명이 동시에 API를 호출하면서 응답시간을 기록한다.
+# 가상 사용자마다 httpx 클라이언트(쿠키 저장소)를 따로 써서 각자 로그인 세션을 가진다.
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+BENCH_PASSWORD = "bench-password-1234"
+
+# 기본 호출 비율 (이름=가중치)
+DEFAULT_MIX = {"login": 1, "list": 4, "me": 4, "create": 1, "update": 1}
+
+
+def parse_mix(text):
+    """"login=1,list=4" 형식 문자열을 {"login": 1, "list": 4} 로 변환"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"알 수 없는 작업 이름: {name} (가능: {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """nearest-rank 방식 백분위수 (정렬된 목록 기준)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """작업 이름별 응답시간(초)과 에러 수 기록"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.statuses = {}
+        self.recording = False
+
+    def add(self, name, seconds, status):
+        if not self.recording:
+            return
+        self.latencies.setdefault(name, []).append(seconds)
+        key = f"{name}:{status}"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status >= 400:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, elapsed):
+        endpoints = {name: _summarize(values, self.errors.get(name, 0), elapsed)
+                     for name, values in sorted(self.latencies.items())}
+        every = [value for values in self.latencies.values() for value in values]
+        return {
+            "total": _summarize(every, sum(self.errors.values()), elapsed),
+            "endpoints": endpoints,
+            "status_counts": dict(sorted(self.statuses.items())),
+        }
+
+
+def _summarize(values, errors, elapsed):
+    values = sorted(values)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+class VirtualUser:
+    def __init__(self, index, client, email, recorder, run_id, rng):
+        self.index = index
+        self.client = client
+        self.email = email
+        self.recorder = recorder
+        self.run_id = run_id
+        self.rng = rng
+        self.counter = 0
+
+    async def call(self, name, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 599  # 연결 실패/타임아웃
+        self.recorder.add(name, time.perf_counter() - start, status)
+        return status
+
+    async def login(self):
+        return await self.call("login", "POST", "/login",
+                               json={"email": self.email, "password": BENCH_PASSWORD})
+
+    async def list(self):
+        return await self.call("list", "GET", "/users", params={"limit": 20})
+
+    async def me(self):
+        return await self.call("me", "GET", "/users/me")
+
+    async def create(self):
+        self.counter += 1
+        email = f"bench-{self.run_id}-new-{self.index}-{self.counter}@example.com"
+        return await self.call("create", "POST", "/users",
+                               json={"name": "bench", "email": email, "password": BENCH_PASSWORD})
+
+    async def update(self):
+        self.counter += 1
+        return await self.call("update", "PATCH", "/users/me", json={"name": f"bench {self.counter}"})
+
+
+async def _create_accounts(client, run_id, count):
+    """측정에 쓸 계정을 POST /users/bulk 로 한 번에 만들고 이메일 목록 반환 (bulk는 로그인이 필요하므로 관리용 계정 먼저)"""
+    admin_email = f"bench-{run_id}-admin@example.com"
+    response = await client.post("/users", json={"name": "bench admin", "email": admin_email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    response = await client.post("/login", json={"email": admin_email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(count)]
+    body = "".join(json.dumps({"name": f"bench {i}", "email": email, "password": BENCH_PASSWORD}) + "\n"
+                   for i, email in enumerate(emails))
+    response = await client.post("/users/bulk", content=body.encode("utf-8"),
+                                  headers={"Content-Type": "application/x-ndjson"}, timeout=300)
+    response.raise_for_status()
+    if response.json()["failed"]:
+        raise RuntimeError(f"측정용 계정 생성 실패: {response.json()['results'][:3]}")
+    return emails
+
+
+async def run_load(base_url, concurrency=10, duration=10.0, warmup=2.0, accounts=None, mix=None,
+                   seed=0, transport=None):
+    """
+    concurrency 명이 warmup 초 동안 예열 후 duration 초 동안 호출한 결과 요약을 반환
+    transport: httpx 전송 계층 (테스트용 ASGITransport 등. 없으면 실제 HTTP)
+    """
+    mix = mix or DEFAULT_MIX
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(base_url=base_url, transport=transport) as admin:
+        emails = await _create_accounts(admin, run_id, accounts or concurrency)
+
+    clients = [httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=30)
+               for _ in range(concurrency)]
+    vusers = [VirtualUser(i, client, emails[i % len(emails)], recorder, run_id, random.Random(seed + i))
+              for i, client in enumerate(clients)]
+    try:
+        # 로그인은 측정 전에 한 번씩 해 둔다 (세션 쿠키 확보)
+        await asyncio.gather(*[vuser.login() for vuser in vusers])
+
+        loop = asyncio.get_running_loop()
+        warmup_end = loop.time() + warmup
+        end = warmup_end + duration
+
+        async def worker(vuser):
+            while loop.time() < end:
+                name = vuser.rng.choices(names, weights)[0]
+                await getattr(vuser, name)()
+
+        started = None
+
+        async def start_clock():
+            nonlocal started
+            await asyncio.sleep(max(0.0, warmup_end - loop.time()))
+            recorder.recording = True
+            started = time.perf_counter()
+
+        await asyncio.gather(start_clock(), *[worker(vuser) for vuser in vusers])
+        elapsed = time.perf_counter() - started if started else 0.0
+    finally:
+        for client in clients:
+            await client.aclose()
+
+    result = recorder.summary(elapsed)
+    result["run_id"] = run_id
+    result["elapsed_seconds"] = round(elapsed, 3)
+    return result
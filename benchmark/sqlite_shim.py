@@ -0,0 +1,162 @@
+# MySQL 없이 벤치마크를 돌리기 위한 SQLite 대용 DB
+# app.core.db 의 비동기 풀(_async_pool) 자리에 aiomysql 풀처럼 동작하는 SQLite 풀을 넣는다.
+# - 회원 API가 쓰는 SQL(%s 자리표시자, LIMIT, IN (...))은 ? 로 바꾸면 SQLite에서도 그대로 동작
+# - MySQL upsert(ON DUPLICATE KEY UPDATE ... VALUES(col))는 SQLite의 ON CONFLICT DO UPDATE ... excluded.col 로 바꿈
+# - UNIQUE 위반은 pymysql IntegrityError(1062)로 바꿔서 라우터의 중복 처리 경로를 그대로 탄다
+# - SQLite 호출은 동기(blocking)이므로 커넥션은 1개만 두고 순서대로 빌려준다.
+#   DB 자체의 동시성보다는 "앱 코드(라우팅, 검증, 세션, 캐시, 직렬화)"의 처리량을 비교하는 용도.
+import asyncio
+import re
+import sqlite3
+import time
+
+import pymysql
+
+from app.core import db, metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    post_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    author_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_author_created ON posts (author_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at);
+CREATE TABLE IF NOT EXISTS user_activity (
+    user_id INTEGER PRIMARY KEY,
+    login_count INTEGER NOT NULL DEFAULT 0,
+    last_login_at TIMESTAMP DEFAULT NULL,
+    last_seen_at TIMESTAMP DEFAULT NULL
+);
+"""
+
+
+_VALUES_FUNC = re.compile(r"\bVALUES\((\w+)\)")
+
+
+def _to_sqlite(query):
+    query = query.replace('%s', '?')
+    if "ON DUPLICATE KEY UPDATE" in query:
+        query = query.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+        query = _VALUES_FUNC.sub(r"excluded.\1", query)
+    return query
+
+
+class SQLiteCursor:
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+        self.lastrowid = None
+        self.rowcount = -1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._cursor.close()
+
+    async def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            self._cursor.execute(_to_sqlite(query), tuple(args or ()))
+        except sqlite3.IntegrityError as e:
+            raise pymysql.err.IntegrityError(db.ER_DUP_ENTRY, str(e))
+        finally:
+            metrics.record_db_query(time.perf_counter() - start)
+        self.lastrowid = self._cursor.lastrowid
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    async def executemany(self, query, args):
+        start = time.perf_counter()
+        try:
+            self._cursor.executemany(_to_sqlite(query), [tuple(row) for row in args])
+        except sqlite3.IntegrityError as e:
+            raise pymysql.err.IntegrityError(db.ER_DUP_ENTRY, str(e))
+        finally:
+            metrics.record_db_query(time.perf_counter() - start)
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    def _row(self, row):
+        if row is None:
+            return None
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    async def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    async def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    async def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+
+class SQLiteConnection:
+    closed = False
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *cursorclass):
+        return SQLiteCursor(self._conn)
+
+    async def commit(self):
+        self._conn.commit()
+
+    async def rollback(self):
+        self._conn.rollback()
+
+    def get_transaction_status(self):
+        return self._conn.in_transaction
+
+    def close(self):
+        pass
+
+
+class SQLitePool:
+    """aiomysql 풀과 같은 acquire()/release()/size/freesize 를 가진 커넥션 1개짜리 풀"""
+
+    def __init__(self, path):
+        conn = sqlite3.connect(path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._conn = SQLiteConnection(conn)
+        self._lock = asyncio.Lock()
+        self.size = 1
+
+    @property
+    def freesize(self):
+        return 0 if self._lock.locked() else 1
+
+    async def acquire(self):
+        await self._lock.acquire()
+        return self._conn
+
+    def release(self, conn):
+        self._lock.release()
+
+    def close(self):
+        self._conn._conn.close()
+
+    async def wait_closed(self):
+        pass
+
+
+def install(path):
+    """app.core.db 의 비동기 풀을 SQLite 풀로 교체 (앱을 import 한 뒤, 첫 요청 전에 호출)"""
+    db._async_pool = SQLitePool(path)
+    return db._async_pool
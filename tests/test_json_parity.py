@@ -0,0 +1,34 @@
+# 빠른 JSON 경로(app/core/fastjson.py)가 기존 응답(response_model=UserOut)과 바이트 단위로 같은지 확인
+# 실행: python -m pytest -q
+import pytest
+
+from app.core import fastjson
+from app.core.fastjson import RowSerializer
+from app.schemas.user import UserOut
+from benchmark.json_parity import expected_many, expected_one, sample_rows
+
+ROWS = sample_rows()
+
+
+@pytest.fixture(params=["orjson", "fallback"])
+def serializer(request, monkeypatch):
+    if request.param == "orjson":
+        if fastjson.orjson is None:
+            pytest.skip("orjson이 설치되어 있지 않음")
+    else:
+        # orjson이 없을 때 쓰는 대체 경로
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return RowSerializer(UserOut)
+
+
+def test_many_matches_response_model(serializer):
+    assert serializer.dumps_many(ROWS) == expected_many(ROWS)
+
+
+@pytest.mark.parametrize("row", ROWS, ids=lambda row: str(row["id"]))
+def test_one_matches_response_model(serializer, row):
+    assert serializer.dumps(row) == expected_one(row)
+
+
+def test_empty_list(serializer):
+    assert serializer.dumps_many([]) == expected_many([])